@@ -0,0 +1,12 @@
+"""Offline benchmarks for the ESO Energy Consumption integration.
+
+Run from the repository root in a Home Assistant development environment::
+
+    python -m benchmarks
+    python -m benchmarks --objects 1 100 1000 --days 1 365 --json results.json
+    python -m benchmarks --baseline results.json
+
+Provider responses are generated (see ``payloads``) and the recorder is
+replaced by a counting stub (see ``stub_recorder``), so no network, account or
+database is needed.
+"""
@@ -0,0 +1,219 @@
+"""Benchmark runner: ``python -m benchmarks --help``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+
+from custom_components.eso import (
+    _async_price_cost_series,
+    async_insert_object_statistics,
+)
+from custom_components.eso.ajax_parser import extract_commands
+from custom_components.eso.const import CONF_CONSUMED, ENERGY_TYPE_MAP
+from custom_components.eso.eso_client import ESOClient
+from custom_components.eso.ignitis_client import IgnitisClient
+from custom_components.eso.price_join import PriceJoin
+from custom_components.eso.tariff import Tariff
+
+from .payloads import eso_range_responses, ignitis_usage
+from .stub_recorder import StubRecorder, fake_hass, install, memory_anchor_store
+
+PRICE_ENTITY = "sensor.electricity_price"
+
+
+@dataclass
+class Result:
+    case: str
+    objects: int
+    days: int
+    seconds: float
+    hours: int
+    peak_bytes: int | None
+    recorder_calls: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}/{self.objects}/{self.days}"
+
+    @property
+    def throughput(self) -> float:
+        return self.hours / self.seconds if self.seconds else float("inf")
+
+
+def _object(index: int, **settings) -> dict:
+    return {"id": str(1000 + index), "name": f"Object {index}", "consumed": True, "returned": True, **settings}
+
+
+class Workload:
+    """Payloads of one range, generated once and shared by every case."""
+
+    def __init__(self, days: int) -> None:
+        self.end = date.today() - timedelta(days=1)
+        self.start = self.end - timedelta(days=days - 1)
+        self.eso_texts = eso_range_responses(self.start, self.end)
+        self.ignitis_text = json.dumps(ignitis_usage(self.start, self.end))
+        self.dataset = IgnitisClient.parse_dataset(json.loads(self.ignitis_text))
+        self.hours = len(self.dataset[ENERGY_TYPE_MAP[CONF_CONSUMED]])
+
+
+# Each case processes ``objects`` objects and returns the hours it handled.
+
+def eso_parse(workload: Workload, objects: int, recorder: StubRecorder) -> int:
+    client = ESOClient("user", "password")
+    hours = 0
+    for _ in range(objects):
+        weeks = []
+        for text in workload.eso_texts:
+            commands = extract_commands(text)
+            client._update_build_id(commands)  # noqa: SLF001
+            weeks.append(client._parse_week(commands))  # noqa: SLF001
+        merged = ESOClient._merge_weeks(weeks, workload.start, workload.end)  # noqa: SLF001
+        hours += sum(len(series) for series in merged.values())
+    return hours
+
+
+def ignitis_parse(workload: Workload, objects: int, recorder: StubRecorder) -> int:
+    hours = 0
+    for _ in range(objects):
+        dataset = IgnitisClient.parse_dataset(json.loads(workload.ignitis_text))
+        hours += len(dataset[ENERGY_TYPE_MAP[CONF_CONSUMED]])
+    return hours
+
+
+def tariff_cost(workload: Workload, objects: int, recorder: StubRecorder) -> int:
+    tariff = Tariff(day_price=0.21, night_price=0.13, day_fee=0.06, night_fee=0.03)
+    series = workload.dataset[ENERGY_TYPE_MAP[CONF_CONSUMED]]
+    for _ in range(objects):
+        tariff.cost(series)
+    return objects * len(series)
+
+
+def price_cost(workload: Workload, objects: int, recorder: StubRecorder) -> int:
+    async def run() -> None:
+        prices = PriceJoin(fake_hass(), {PRICE_ENTITY})
+        for index in range(objects):
+            obj = _object(index, price_entity=PRICE_ENTITY, distribution_fee=0.06)
+            await _async_price_cost_series(obj, workload.dataset, prices)
+
+    asyncio.run(run())
+    return objects * workload.hours
+
+
+def write_statistics(workload: Workload, objects: int, recorder: StubRecorder) -> int:
+    """First import (sums from the recorder) followed by a repeated import of
+    the same data, which the anchors must skip."""
+
+    async def run() -> None:
+        hass = fake_hass()
+        anchors = memory_anchor_store()
+        prices = PriceJoin(hass, set())
+        objs = [_object(index, fixed_price=0.21, night_price=0.13) for index in range(objects)]
+        for _ in range(2):
+            for obj in objs:
+                await async_insert_object_statistics(hass, obj, workload.dataset, anchors, prices)
+
+    asyncio.run(run())
+    return 2 * objects * workload.hours
+
+
+CASES: dict[str, Callable[[Workload, int, StubRecorder], int]] = {
+    "eso_parse": eso_parse,
+    "ignitis_parse": ignitis_parse,
+    "tariff_cost": tariff_cost,
+    "price_cost": price_cost,
+    "write_statistics": write_statistics,
+}
+
+
+def run_case(name: str, workload: Workload, objects: int, days: int, memory: bool) -> Result:
+    case = CASES[name]
+    recorder = StubRecorder()
+    gc.collect()
+    with install(recorder):
+        started = time.perf_counter()
+        hours = case(workload, objects, recorder)
+        seconds = time.perf_counter() - started
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        with install(StubRecorder()):
+            case(workload, objects, StubRecorder())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return Result(name, objects, days, seconds, hours, peak, sum(
+        recorder.calls[call] for call in ("statistics_during_period", "async_add_external_statistics")
+    ))
+
+
+def _format(result: Result) -> str:
+    peak = "-" if result.peak_bytes is None else f"{result.peak_bytes / 2**20:8.1f}"
+    return (
+        f"{result.case:<17} {result.objects:>7} {result.days:>5} {result.seconds:>9.3f} "
+        f"{result.throughput:>13,.0f} {peak:>9} {result.recorder_calls:>9}"
+    )
+
+
+def compare(results: list[Result], baseline_path: str, tolerance: float) -> list[str]:
+    """Return the regressions of ``results`` against a saved baseline."""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {f"{r['case']}/{r['objects']}/{r['days']}": r for r in json.load(file)}
+    regressions = []
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            continue
+        if result.seconds > base["seconds"] * (1 + tolerance):
+            regressions.append(f"{result.key}: {base['seconds']:.3f}s -> {result.seconds:.3f}s")
+        if result.recorder_calls > base["recorder_calls"]:
+            regressions.append(
+                f"{result.key}: recorder calls {base['recorder_calls']} -> {result.recorder_calls}"
+            )
+        if result.peak_bytes and base.get("peak_bytes") and result.peak_bytes > base["peak_bytes"] * (1 + tolerance):
+            regressions.append(f"{result.key}: peak memory {base['peak_bytes']} -> {result.peak_bytes}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--objects", type=int, nargs="+", default=[1, 10, 100], help="object counts")
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 7, 365], help="range lengths in days")
+    parser.add_argument("--case", choices=sorted(CASES), nargs="+", default=list(CASES), help="cases to run")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass for peak memory")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="fail on regressions against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline (default 0.2)")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<17} {'objects':>7} {'days':>5} {'seconds':>9} {'hours/s':>13} {'peak MiB':>9} {'recorder':>9}")
+    results: list[Result] = []
+    for days in args.days:
+        workload = Workload(days)
+        for name in args.case:
+            for objects in args.objects:
+                result = run_case(name, workload, objects, days, not args.no_memory)
+                results.append(result)
+                print(_format(result), flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
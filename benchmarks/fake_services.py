@@ -0,0 +1,422 @@
+"""Local stand-in for ESO, Ignitis and the 2FA mailbox.
+
+One HTTP server answers both providers (their paths do not overlap) and one
+plain IMAP server delivers the ESO login codes:
+
+- ESO: the Drupal login form, the redirect to the TFA page, the code email,
+  the TFA submit that sets the session cookie, the consumption page with its
+  form tokens and ``objects[]`` select, and the AJAX consumption endpoint,
+  which rotates the ``form_build_id`` on every post like Drupal does;
+- Ignitis: ``/api/users/login`` and ``/api/v2/objects/usage/{object}/day``;
+- IMAP: LOGIN, SELECT/STATUS with UIDNEXT, UID SEARCH/FETCH/STORE, EXPUNGE,
+  NOOP and IDLE, one mailbox per account.
+
+Every HTTP request waits ``latency`` (plus up to ``jitter``) seconds and fails
+with a 503 at ``error_rate``; codes arrive ``otp_delay`` seconds after the
+password was accepted. Point the clients at ``base_url`` and give them an IMAP
+config with ``"ssl": False`` (see ``FakeServices.imap_config``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import re
+import secrets
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from aiohttp import web
+
+from custom_components.eso.const import DEFAULT_IMAP_SENDER
+
+from .payloads import eso_week_response, ignitis_usage
+
+SESSION_COOKIE = "SSESS" + "5f1c0a4e9d2b7c3f8e6a1d4b9c7e2f0a"
+MAILBOX_PASSWORD = "mailbox-password"
+
+
+@dataclass
+class Account:
+    """A provider account with its objects and 2FA mailbox."""
+
+    username: str
+    password: str
+    objects: list[str]
+    mailbox: list[tuple[int, bytes, bool]] = field(default_factory=list)
+    uid_next: int = 1
+    arrived: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def deliver(self, message: bytes) -> None:
+        self.mailbox.append((self.uid_next, message, False))
+        self.uid_next += 1
+        self.arrived.set()
+        self.arrived = asyncio.Event()
+
+
+def _code_email(code: str) -> bytes:
+    html = f"<html><body><p>Sveiki,</p><p>Jūsų kodas: <b>{code}</b></p></body></html>"
+    return (
+        f"Date: {email.utils.formatdate(localtime=True)}\r\n"
+        f"From: ESO <{DEFAULT_IMAP_SENDER}>\r\n"
+        "Subject: Prisijungimo kodas\r\n"
+        "MIME-Version: 1.0\r\n"
+        "Content-Type: text/html; charset=utf-8\r\n"
+        "Content-Transfer-Encoding: 8bit\r\n"
+        "\r\n"
+        f"{html}\r\n"
+    ).encode()
+
+
+def _login_page() -> str:
+    return (
+        '<html><body><form class="user-login-form" id="user-login-form" method="post">'
+        '<input type="text" name="name"><input type="password" name="pass">'
+        '<input type="hidden" name="form_build_id" value="form-login">'
+        '<input type="hidden" name="form_id" value="user_login_form">'
+        "</form></body></html>"
+    )
+
+
+def _tfa_page(build_id: str) -> str:
+    return (
+        '<html><body><form class="gpc-tfa-login-auth-form" id="gpc-tfa-login-auth-form" method="post">'
+        '<input type="text" name="code">'
+        f'<input type="hidden" name="form_build_id" value="{build_id}">'
+        '<input type="hidden" name="form_id" value="gpc_tfa_login_auth_form">'
+        "</form></body></html>"
+    )
+
+
+def _consumption_page(objects: list[str], build_id: str, token: str) -> str:
+    options = "".join(
+        f'<option value="{obj}">Testo g. {index + 1}, 01100 Vilnius, {40000000 + int(obj) % 1000000}</option>'
+        for index, obj in enumerate(objects)
+    )
+    return (
+        '<html><body><form class="eso-consumption-history-form" id="eso-consumption-history-form" method="post">'
+        f'<select name="objects[]" multiple>{options}</select>'
+        f'<input type="hidden" name="form_build_id" value="{build_id}">'
+        f'<input type="hidden" name="form_token" value="{token}">'
+        '<input type="hidden" name="form_id" value="eso_consumption_history_form">'
+        "</form></body></html>"
+    )
+
+
+class FakeServices:
+    """The fake HTTP and IMAP servers of a load test."""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        otp_delay: float = 1.0,
+        html_bytes: int = 64 * 1024,
+        seed: int = 0,
+    ) -> None:
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.otp_delay = otp_delay
+        self.html_bytes = html_bytes
+        self.accounts: dict[str, Account] = {}
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        # ESO session id -> (username, current form_build_id, form_token)
+        self._sessions: dict[str, list[str]] = {}
+        # TFA token -> (username, code, build id)
+        self._pending: dict[str, tuple[str, str, str]] = {}
+        # Ignitis API token -> username
+        self._tokens: dict[str, str] = {}
+        self._runner: web.AppRunner | None = None
+        self._imap: asyncio.Server | None = None
+        self.http_port = 0
+        self.imap_port = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.http_port}"
+
+    def imap_config(self, username: str) -> dict:
+        return {
+            "host": self.host,
+            "port": self.imap_port,
+            "username": username,
+            "password": MAILBOX_PASSWORD,
+            "sender": DEFAULT_IMAP_SENDER,
+            "folder": "INBOX",
+            "ssl": False,
+        }
+
+    def add_account(self, username: str, password: str, objects: list[str]) -> Account:
+        account = Account(username, password, objects)
+        self.accounts[username] = account
+        return account
+
+    async def start(self) -> None:
+        app = web.Application(middlewares=[self._conditions])
+        app.router.add_route("*", "/", self._eso_login)
+        app.router.add_route("*", "/user/login/tfa/{token}", self._eso_tfa)
+        app.router.add_post("/consumption", self._eso_consumption)
+        app.router.add_post("/api/users/login", self._ignitis_login)
+        app.router.add_get("/api/v2/objects/usage/{object}/day", self._ignitis_usage)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.http_port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self._imap = await asyncio.start_server(self._imap_session, self.host, 0)
+        self.imap_port = self._imap.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._imap is not None:
+            self._imap.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    # ---- HTTP -------------------------------------------------------------
+
+    @web.middleware
+    async def _conditions(self, request: web.Request, handler) -> web.StreamResponse:
+        self.stats["http_requests"] += 1
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats["http_errors_injected"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+        return await handler(request)
+
+    def _session_user(self, request: web.Request) -> tuple[str, list[str]] | None:
+        sid = request.cookies.get(SESSION_COOKIE)
+        if sid and sid in self._sessions:
+            return sid, self._sessions[sid]
+        return None
+
+    async def _eso_login(self, request: web.Request) -> web.Response:
+        if request.method == "GET":
+            session = self._session_user(request)
+            if session is None:
+                return web.Response(text=_login_page(), content_type="text/html")
+            _, (username, build_id, token) = session
+            page = _consumption_page(self.accounts[username].objects, build_id, token)
+            return web.Response(text=page, content_type="text/html")
+        form = await request.post()
+        account = self.accounts.get(str(form.get("name")))
+        if account is None or form.get("pass") != account.password:
+            self.stats["eso_login_rejected"] += 1
+            return web.Response(text=_login_page(), content_type="text/html")
+        token = secrets.token_urlsafe(12)
+        code = f"{self._rng.randrange(10**6):06d}"
+        self._pending[token] = (account.username, code, f"form-tfa-{secrets.token_hex(8)}")
+        asyncio.get_running_loop().call_later(self.otp_delay, self._send_code, account, code)
+        return web.Response(status=303, headers={"Location": f"/user/login/tfa/{token}"})
+
+    def _send_code(self, account: Account, code: str) -> None:
+        self.stats["otp_emails"] += 1
+        account.deliver(_code_email(code))
+
+    async def _eso_tfa(self, request: web.Request) -> web.Response:
+        pending = self._pending.get(request.match_info["token"])
+        if pending is None:
+            return web.Response(status=404)
+        username, code, build_id = pending
+        if request.method == "GET":
+            return web.Response(text=_tfa_page(build_id), content_type="text/html")
+        form = await request.post()
+        if form.get("code") != code or form.get("form_build_id") != build_id:
+            self.stats["eso_tfa_rejected"] += 1
+            return web.Response(text=_tfa_page(build_id), content_type="text/html")
+        del self._pending[request.match_info["token"]]
+        sid = secrets.token_urlsafe(24)
+        self._sessions[sid] = [username, f"form-{secrets.token_hex(8)}", secrets.token_urlsafe(16)]
+        self.stats["eso_logins"] += 1
+        response = web.Response(status=303, headers={"Location": "/?destination=/consumption"})
+        response.set_cookie(SESSION_COOKIE, sid, path="/", httponly=True, max_age=3 * 7 * 86400)
+        return response
+
+    async def _eso_consumption(self, request: web.Request) -> web.Response:
+        session = self._session_user(request)
+        form = await request.post()
+        if session is None or form.get("form_token") != session[1][2]:
+            return web.Response(status=403)
+        _, state = session
+        if form.get("form_build_id") != state[1]:
+            # Drupal rejects a stale build id with a message and no data.
+            self.stats["eso_stale_build_id"] += 1
+            return web.json_response([{"command": "insert", "data": "<div>Forma pasikeitė</div>"}])
+        obj = str(form.get("objects[]"))
+        if obj not in self.accounts[state[0]].objects:
+            return web.json_response([])
+        state[1] = f"form-{secrets.token_hex(8)}"
+        active_date = datetime.strptime(str(form["active_date_value"]), "%Y-%m-%d %H:%M").date()
+        self.stats["eso_weeks"] += 1
+        text = eso_week_response(active_date, int(obj), self.html_bytes, state[1])
+        return web.Response(text=text, content_type="application/json")
+
+    async def _ignitis_login(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        account = self.accounts.get(str(form.get("email")))
+        if account is None or form.get("password") != account.password:
+            return web.json_response({"message": "Invalid credentials"}, status=401)
+        token = secrets.token_urlsafe(24)
+        self._tokens[token] = account.username
+        self.stats["ignitis_logins"] += 1
+        return web.json_response(
+            {
+                "token": token,
+                "user": {
+                    "objects": [
+                        {"uoid": int(obj), "address": f"Testo g. {index + 1}, Vilnius"}
+                        for index, obj in enumerate(account.objects)
+                    ]
+                },
+            }
+        )
+
+    async def _ignitis_usage(self, request: web.Request) -> web.Response:
+        username = self._tokens.get(request.headers.get("X-API-KEY", ""))
+        if username is None:
+            return web.json_response({"message": "Unauthorized"}, status=401)
+        obj = request.match_info["object"]
+        if obj not in self.accounts[username].objects:
+            return web.json_response({"message": "Not found"}, status=404)
+        start = date.fromisoformat(request.query["dateFrom"])
+        end = date.fromisoformat(request.query["dateTo"])
+        self.stats["ignitis_usage"] += 1
+        return web.json_response(ignitis_usage(start, end, int(obj)))
+
+    # ---- IMAP -------------------------------------------------------------
+
+    async def _imap_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats["imap_connections"] += 1
+        writer.write(b"* OK [CAPABILITY IMAP4rev1 IDLE] fake mailbox ready\r\n")
+        account: Account | None = None
+        try:
+            while line := await reader.readline():
+                tag, _, rest = line.decode().rstrip("\r\n").partition(" ")
+                command, _, args = rest.partition(" ")
+                command = command.upper()
+                if command == "UID":
+                    command, _, args = args.partition(" ")
+                    command = "UID " + command.upper()
+                if command == "LOGOUT":
+                    writer.write(f"* BYE logging out\r\n{tag} OK LOGOUT completed\r\n".encode())
+                    await writer.drain()
+                    return
+                if command == "LOGIN":
+                    user, password = (part.strip('"') for part in args.split(" ", 1))
+                    account = self.accounts.get(user)
+                    if account is None or password != MAILBOX_PASSWORD:
+                        writer.write(f"{tag} NO [AUTHENTICATIONFAILED] invalid credentials\r\n".encode())
+                        account = None
+                    else:
+                        writer.write(f"{tag} OK LOGIN completed\r\n".encode())
+                elif command == "CAPABILITY":
+                    writer.write(f"* CAPABILITY IMAP4rev1 IDLE\r\n{tag} OK done\r\n".encode())
+                elif account is None:
+                    writer.write(f"{tag} BAD not authenticated\r\n".encode())
+                elif command == "IDLE":
+                    await self._imap_idle(tag, account, reader, writer)
+                else:
+                    writer.write(self._imap_command(tag, command, args, account))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _imap_command(self, tag: str, command: str, args: str, account: Account) -> bytes:
+        live = [(uid, message) for uid, message, deleted in account.mailbox if not deleted]
+        if command == "SELECT":
+            return (
+                f"* {len(live)} EXISTS\r\n* OK [UIDNEXT {account.uid_next}] predicted\r\n"
+                f"{tag} OK [READ-WRITE] SELECT completed\r\n"
+            ).encode()
+        if command == "STATUS":
+            return f'* STATUS "INBOX" (UIDNEXT {account.uid_next})\r\n{tag} OK STATUS completed\r\n'.encode()
+        if command == "NOOP":
+            return f"* {len(live)} EXISTS\r\n{tag} OK NOOP completed\r\n".encode()
+        if command == "UID SEARCH":
+            uids = [uid for uid, _ in live]
+            match = re.search(r"UID (\d+):\*", args)
+            if match and uids:
+                # "n:*" always matches the newest message, even below n.
+                uids = [uid for uid in uids if uid >= int(match.group(1))] or [uids[-1]]
+            return f"* SEARCH {' '.join(map(str, uids))}\r\n{tag} OK SEARCH completed\r\n".encode()
+        if command == "UID FETCH":
+            uid_text, _, items = args.partition(" ")
+            message = dict(live).get(int(uid_text))
+            if message is None:
+                return f"{tag} OK FETCH completed\r\n".encode()
+            seq = [uid for uid, _ in live].index(int(uid_text)) + 1
+            self.stats["imap_fetches"] += 1
+            return b"".join(self._fetch_items(seq, int(uid_text), message, items)) + f"{tag} OK FETCH completed\r\n".encode()
+        if command == "UID STORE":
+            uid = int(args.split(" ", 1)[0])
+            account.mailbox = [
+                (mail_uid, message, deleted or mail_uid == uid)
+                for mail_uid, message, deleted in account.mailbox
+            ]
+            return f"{tag} OK STORE completed\r\n".encode()
+        if command == "EXPUNGE":
+            expunged = [
+                index + 1
+                for index, (_, _, deleted) in enumerate(account.mailbox)
+                if deleted
+            ]
+            account.mailbox = [mail for mail in account.mailbox if not mail[2]]
+            lines = "".join(f"* {seq} EXPUNGE\r\n" for seq in reversed(expunged))
+            return f"{lines}{tag} OK EXPUNGE completed\r\n".encode()
+        return f"{tag} BAD unsupported command {command}\r\n".encode()
+
+    @staticmethod
+    def _fetch_items(seq: int, uid: int, message: bytes, items: str) -> list[bytes]:
+        header, _, text = message.partition(b"\r\n\r\n")
+        if "RFC822" in items.upper():
+            return [f"* {seq} FETCH (UID {uid} RFC822 {{{len(message)}}}\r\n".encode(), message, b")\r\n"]
+        fields = re.search(r"HEADER\.FIELDS \(([^)]*)\)", items)
+        wanted = set(fields.group(1).upper().split()) if fields else set()
+        header_lines = [
+            line
+            for line in header.split(b"\r\n")
+            if line.split(b":", 1)[0].decode().upper() in wanted
+        ]
+        header_part = b"\r\n".join(header_lines) + b"\r\n\r\n"
+        partial = re.search(r"TEXT\]<0\.(\d+)>", items)
+        body_part = text[: int(partial.group(1))] if partial else text
+        return [
+            f"* {seq} FETCH (UID {uid} BODY[HEADER.FIELDS ({' '.join(sorted(wanted))})] {{{len(header_part)}}}\r\n".encode(),
+            header_part,
+            f" BODY[TEXT]<0> {{{len(body_part)}}}\r\n".encode(),
+            body_part,
+            b")\r\n",
+        ]
+
+    async def _imap_idle(
+        self,
+        tag: str,
+        account: Account,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        writer.write(b"+ idling\r\n")
+        await writer.drain()
+        done = asyncio.ensure_future(reader.readline())
+        arrived = asyncio.ensure_future(account.arrived.wait())
+        try:
+            await asyncio.wait((done, arrived), return_when=asyncio.FIRST_COMPLETED)
+            if arrived.done():
+                live = sum(1 for mail in account.mailbox if not mail[2])
+                writer.write(f"* {live} EXISTS\r\n".encode())
+                await writer.drain()
+                await done
+        finally:
+            arrived.cancel()
+        if done.result():
+            writer.write(f"{tag} OK IDLE terminated\r\n".encode())
@@ -0,0 +1,192 @@
+"""End-to-end import load test against the local fake services.
+
+Every account runs the async client flow the integration uses: ESO logs in
+with the password, waits for the code email over IMAP, submits it and fetches
+each object's week; Ignitis logs in and fetches each object's usage. Accounts
+run concurrently on one event loop, with a bare ``HomeAssistant`` providing the
+aiohttp sessions and executor, against ``fake_services`` on localhost (served
+from its own thread), so no network or real account is needed::
+
+    python -m benchmarks.load_test --accounts 50 --objects 3 --latency 0.05 --error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import DATA_RESOLVER
+
+from custom_components.eso.const import CONF_CONSUMED, ENERGY_TYPE_MAP, PROVIDER_ESO, PROVIDER_IGNITIS
+from custom_components.eso.eso_client import AsyncESOClient
+from custom_components.eso.ignitis_client import AsyncIgnitisClient
+
+from .fake_services import FakeServices
+
+
+@dataclass
+class AccountResult:
+    provider: str
+    ok: bool = False
+    error: str | None = None
+    login_seconds: float = 0.0
+    fetch_seconds: list[float] = field(default_factory=list)
+    hours: int = 0
+
+
+class ServiceThread:
+    """Runs FakeServices on an event loop in a background thread."""
+
+    def __init__(self, services: FakeServices) -> None:
+        self.services = services
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def __enter__(self) -> FakeServices:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.services.start(), self._loop).result()
+        return self.services
+
+    def __exit__(self, *exc_info) -> None:
+        asyncio.run_coroutine_threadsafe(self.services.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def bare_hass() -> HomeAssistant:
+    """A HomeAssistant instance good enough for the clients: executor jobs and
+    aiohttp sessions (with a plain resolver instead of the zeroconf one)."""
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="eso_load_test"))
+    hass.data[DATA_RESOLVER] = aiohttp.ThreadedResolver()
+    return hass
+
+
+async def run_account(
+    hass: HomeAssistant,
+    services: FakeServices,
+    provider: str,
+    username: str,
+    password: str,
+    objects: list[str],
+    days: int,
+) -> AccountResult:
+    result = AccountResult(provider)
+    end = date.today() - timedelta(days=1)
+    start = end - timedelta(days=days - 1)
+    if provider == PROVIDER_ESO:
+        client: AsyncESOClient | AsyncIgnitisClient = AsyncESOClient(
+            hass, username, password, services.imap_config(username), base_url=services.base_url
+        )
+    else:
+        client = AsyncIgnitisClient(hass, username, password, base_url=services.base_url)
+    try:
+        started = time.perf_counter()
+        await client.async_login()
+        result.login_seconds = time.perf_counter() - started
+        for obj in objects:
+            started = time.perf_counter()
+            if days == 1:
+                dataset = await client.async_fetch_dataset(
+                    obj, datetime.combine(end + timedelta(days=1), datetime.min.time())
+                )
+            else:
+                dataset = await client.async_fetch_range_dataset(obj, start, end)
+            result.fetch_seconds.append(time.perf_counter() - started)
+            series = (dataset or {}).get(ENERGY_TYPE_MAP[CONF_CONSUMED])
+            result.hours += len(series) if series else 0
+        result.ok = bool(objects) and result.hours > 0
+        if not result.ok:
+            result.error = "no data"
+    except Exception as err:  # noqa: BLE001 - reported per account
+        result.error = f"{type(err).__name__}: {err}"
+    finally:
+        if isinstance(client, AsyncESOClient):
+            await client.async_close()
+    return result
+
+
+async def run_accounts(
+    services: FakeServices, jobs: list[tuple[str, str, str, list[str]]], days: int, workers: int
+) -> tuple[list[AccountResult], float]:
+    """Run every account, at most ``workers`` at a time; return the results
+    and the wall time."""
+    hass = bare_hass()
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run(job: tuple[str, str, str, list[str]]) -> AccountResult:
+        async with semaphore:
+            return await run_account(hass, services, *job, days)
+
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(run(job) for job in jobs))
+        return results, time.perf_counter() - started
+    finally:
+        await hass.async_stop(force=True)
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test", description=__doc__)
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--objects", type=int, default=2, help="objects per account")
+    parser.add_argument("--days", type=int, default=1, help="days fetched per object (>1 uses the range fetch)")
+    parser.add_argument("--provider", choices=[PROVIDER_ESO, PROVIDER_IGNITIS, "both"], default="both")
+    parser.add_argument("--workers", type=int, default=16, help="accounts running at the same time")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every HTTP response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="random extra latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP requests failing with 503")
+    parser.add_argument("--otp-delay", type=float, default=1.0, help="seconds until the code email arrives")
+    args = parser.parse_args(argv)
+
+    providers = [PROVIDER_ESO, PROVIDER_IGNITIS] if args.provider == "both" else [args.provider]
+    services = FakeServices(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, otp_delay=args.otp_delay
+    )
+    jobs = []
+    for index in range(args.accounts):
+        provider = providers[index % len(providers)]
+        username = f"user{index}@example.com"
+        objects = [str(100000 + index * 100 + obj) for obj in range(args.objects)]
+        services.add_account(username, f"password{index}", objects)
+        jobs.append((provider, username, f"password{index}", objects))
+
+    with ServiceThread(services):
+        results, wall = asyncio.run(run_accounts(services, jobs, args.days, args.workers))
+
+    failed = [result for result in results if not result.ok]
+    print(f"accounts: {len(results)}, failed: {len(failed)}, wall time: {wall:.2f}s")
+    for provider in providers:
+        mine = [result for result in results if result.provider == provider and result.ok]
+        logins = [result.login_seconds for result in mine]
+        fetches = [seconds for result in mine for seconds in result.fetch_seconds]
+        if not mine:
+            continue
+        print(
+            f"{provider:<8} login p50 {statistics.median(logins):.3f}s p95 {_percentile(logins, 0.95):.3f}s | "
+            f"fetch p50 {statistics.median(fetches):.3f}s p95 {_percentile(fetches, 0.95):.3f}s | "
+            f"hours {sum(result.hours for result in mine)}"
+        )
+    print("server:", ", ".join(f"{key}={value}" for key, value in sorted(services.stats.items())))
+    for result in failed[:10]:
+        print(f"failed {result.provider}: {result.error}", file=sys.stderr)
+    return 1 if failed and not args.error_rate else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Synthetic provider payloads shaped like the real responses.
+
+ESO answers a consumption request with a Drupal AJAX command list: ``insert``
+commands carrying the rendered form HTML, an ``update_build_id`` command and a
+``settings`` command whose ``graphics_data`` holds one week of hourly records
+per energy type. Ignitis answers ``usage/{object}/day`` with a JSON object of
+hourly records and the export balance. Local wall-clock times follow the real
+DST transitions, so the repeated autumn hour is reported twice and the skipped
+spring hour is absent, as the providers do.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from custom_components.eso.const import POWER_CONSUMED, POWER_RETURNED, TIMEZONE
+from custom_components.eso.eso_client import CONSUMPTION_FORM_ID, plan_week_requests
+from custom_components.eso.hour_grid import day_hours
+
+_TZ = ZoneInfo(TIMEZONE)
+
+# Size of the rendered form HTML sent along with every ESO response
+ESO_HTML_BYTES = 256 * 1024
+
+
+def wall_hours(start: date, end: date) -> list[datetime]:
+    """Naive local hour starts of ``start``..``end`` (inclusive), as reported
+    by the providers."""
+    hours: list[datetime] = []
+    day = start
+    while day <= end:
+        hours.extend(
+            datetime.fromtimestamp(ts, _TZ).replace(tzinfo=None) for ts in day_hours(day)
+        )
+        day += timedelta(days=1)
+    return hours
+
+
+def _readings(hours: list[datetime], rng: random.Random) -> list[tuple[float, float]]:
+    readings = []
+    for wall in hours:
+        # Some evening consumption peak and midday generation
+        consumed = rng.uniform(0.1, 0.6) + (0.8 if 17 <= wall.hour <= 21 else 0.0)
+        returned = max(0.0, rng.uniform(-0.5, 2.5)) if 9 <= wall.hour <= 16 else 0.0
+        readings.append((round(consumed, 3), round(returned, 3)))
+    return readings
+
+
+def _html_blob(size: int, rng: random.Random) -> str:
+    row = '<tr class="row-{0}"><td data-label="Data">{0}</td><td>{1:.3f} kWh</td></tr>\n'
+    parts = ['<form id="eso-consumption-history-form" data-drupal-selector="eso-consumption-history-form">']
+    length = len(parts[0])
+    index = 0
+    while length < size:
+        part = row.format(index, rng.random())
+        parts.append(part)
+        length += len(part)
+        index += 1
+    parts.append("</form>")
+    return "".join(parts)
+
+
+def eso_week_response(
+    active_date: date,
+    seed: int = 0,
+    html_bytes: int = ESO_HTML_BYTES,
+    build_id: str | None = None,
+) -> str:
+    """Return the AJAX response text of the week request for ``active_date``
+    (the seven days ending on it), rotating the form to ``build_id``."""
+    rng = random.Random(seed * 100003 + active_date.toordinal())
+    hours = wall_hours(active_date - timedelta(days=6), active_date)
+    readings = _readings(hours, rng)
+    datasets = [
+        {
+            "key": key,
+            "label": label,
+            "color": color,
+            "record": [
+                {"date": wall.strftime("%Y%m%d%H%M"), "value": str(reading[column])}
+                for wall, reading in zip(hours, readings, strict=True)
+            ],
+        }
+        for column, (key, label, color) in enumerate(
+            ((POWER_CONSUMED, "Suvartota", "#f7a600"), (POWER_RETURNED, "Atiduota", "#6fb63f"))
+        )
+    ]
+    build_id = build_id or f"form-{rng.getrandbits(64):016x}"
+    commands = [
+        {"command": "insert", "method": "replaceWith", "selector": "#eso-consumption-history-form", "data": _html_blob(html_bytes, rng)},
+        {"command": "update_build_id", "old": "form-previous", "new": build_id},
+        {
+            "command": "settings",
+            "settings": {
+                "ajaxPageState": {"theme": "eso", "libraries": "core/drupal.ajax,eso/charts"},
+                CONSUMPTION_FORM_ID: {"graphics_data": {"datasets": datasets, "period": "week"}},
+            },
+            "merge": True,
+        },
+        {"command": "insert", "method": "html", "selector": "#messages", "data": _html_blob(html_bytes // 16, rng)},
+    ]
+    return json.dumps(commands)
+
+
+def eso_range_responses(start: date, end: date, seed: int = 0, html_bytes: int = ESO_HTML_BYTES) -> list[str]:
+    """Return the week responses ``fetch_range_dataset`` receives for a range."""
+    return [
+        eso_week_response(active_date, seed, html_bytes)
+        for active_date in plan_week_requests(start, end)
+    ]
+
+
+def ignitis_usage(start: date, end: date, seed: int = 0) -> dict:
+    """Return the decoded ``usage/{object}/day`` response for a range."""
+    rng = random.Random(seed * 100003 + start.toordinal())
+    hours = wall_hours(start, end)
+    return {
+        "exportBalance": {"balance": round(rng.uniform(0, 500), 3)},
+        "data": [
+            {
+                "startTime": wall.strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (wall + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "consumed": consumed,
+                "supplied": returned,
+            }
+            for wall, (consumed, returned) in zip(hours, _readings(hours, rng), strict=True)
+        ],
+    }
@@ -0,0 +1,118 @@
+"""Counting stand-in for the Home Assistant recorder.
+
+``install`` swaps the recorder functions the integration imported for this
+stub, which answers from memory and counts what it is asked:
+
+- price entities (anything outside the ``eso:`` source) get one mean per hour
+  for the requested window, like a price sensor with complete statistics;
+- previous-sum lookups of ``eso:`` statistics get a single earlier row;
+- re-chain reads of later ``eso:`` rows get nothing, as for the newest data.
+
+Executor jobs run inline, so the measured time is the integration's own work.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+from custom_components import eso
+from custom_components.eso import price_join, sum_rechain
+from custom_components.eso.anchor_store import AnchorStore
+from custom_components.eso.const import DOMAIN
+from custom_components.eso.hourly_series import HOUR_SECONDS
+
+_PATCHED_MODULES = (eso, price_join, sum_rechain)
+
+
+class StubRecorder:
+    """Recorder answering statistics queries from memory and counting calls."""
+
+    def __init__(self, seed: int = 0) -> None:
+        self.calls: Counter[str] = Counter()
+        self.points_written = 0
+        self._rng = random.Random(seed)
+
+    # recorder.get_instance(hass) ------------------------------------------
+
+    def get_instance(self, hass) -> StubRecorder:
+        return self
+
+    async def async_add_executor_job(self, func, *args):
+        self.calls["executor_jobs"] += 1
+        return func(*args)
+
+    # recorder.statistics -----------------------------------------------------
+
+    def statistics_during_period(
+        self,
+        hass,
+        start_time: datetime,
+        end_time: datetime | None,
+        statistic_ids: set[str] | None,
+        period: str,
+        units,
+        types: set[str],
+    ) -> dict[str, list[dict]]:
+        self.calls["statistics_during_period"] += 1
+        result: dict[str, list[dict]] = {}
+        for statistic_id in statistic_ids or ():
+            if not statistic_id.startswith(f"{DOMAIN}:"):
+                result[statistic_id] = self._price_rows(start_time, end_time, period)
+            elif types == {"sum"}:
+                before = end_time.timestamp() - HOUR_SECONDS
+                result[statistic_id] = [{"start": before, "sum": 1000.0}]
+        self.calls["rows_returned"] += sum(len(rows) for rows in result.values())
+        return result
+
+    def _price_rows(self, start: datetime, end: datetime, period: str) -> list[dict]:
+        step = HOUR_SECONDS if period == "hour" else 300
+        first = start.timestamp() - start.timestamp() % step
+        return [
+            {"start": ts, "mean": round(self._rng.uniform(0.05, 0.35), 5)}
+            for ts in range(int(first), int(end.timestamp()), step)
+        ]
+
+    def async_add_external_statistics(self, hass, metadata, statistics) -> None:
+        self.calls["async_add_external_statistics"] += 1
+        self.points_written += len(statistics)
+
+
+@contextmanager
+def install(recorder: StubRecorder) -> Iterator[StubRecorder]:
+    """Route the integration's recorder calls to ``recorder`` meanwhile."""
+    saved = []
+    for module in _PATCHED_MODULES:
+        for name in ("get_instance", "statistics_during_period", "async_add_external_statistics"):
+            if hasattr(module, name):
+                saved.append((module, name, getattr(module, name)))
+                setattr(module, name, getattr(recorder, name))
+    try:
+        yield recorder
+    finally:
+        for module, name, original in saved:
+            setattr(module, name, original)
+
+
+class _MemoryStore:
+    """``Store`` replacement keeping nothing on disk."""
+
+    def async_delay_save(self, data_func, delay: float = 0) -> None:
+        data_func()
+
+
+def memory_anchor_store() -> AnchorStore:
+    """Return an empty AnchorStore that does not need a running hass."""
+    anchors = AnchorStore.__new__(AnchorStore)
+    anchors._store = _MemoryStore()  # noqa: SLF001 - benchmark harness
+    anchors._anchors = {}  # noqa: SLF001
+    return anchors
+
+
+def fake_hass() -> SimpleNamespace:
+    """The bits of ``hass`` the statistics helpers touch."""
+    return SimpleNamespace(is_stopping=False)
@@ -1,6 +1,10 @@
+import asyncio
+import contextlib
 import logging
+import os
 import random
-from collections.abc import Awaitable, Callable
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 
@@ -22,41 +26,59 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_PASSWORD,
     CONF_USERNAME,
+    Platform,
     UnitOfEnergy,
 )
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ServiceValidationError
 from homeassistant.helpers import issue_registry as ir
-from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_time,
+    async_track_time_interval,
+)
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTR_CONFIG_ENTRY_ID,
     ATTR_DATE,
+    ATTR_END_DATE,
+    ATTR_START_DATE,
     CONF_CONSUMED,
     CONF_COST,
+    CONF_DISTRIBUTION_FEE,
     CONF_EXPORT_BALANCE,
+    CONF_FETCH_CONCURRENCY,
     CONF_FIXED_PRICE,
     CONF_IMAP,
     CONF_IMAP_FOLDER,
     CONF_IMAP_HOST,
     CONF_IMAP_PORT,
     CONF_IMAP_SENDER,
+    CONF_KEEPALIVE_MINUTES,
+    CONF_NIGHT_DISTRIBUTION_FEE,
+    CONF_NIGHT_PRICE,
     CONF_OBJECTS,
     CONF_PRICE_CURRENCY,
     CONF_PRICE_ENTITY,
     CONF_PROVIDER,
     CONF_RETURNED,
+    CONF_SUB_HOURLY,
     DAILY_IMPORT_WINDOW_SECONDS,
     DAILY_IMPORT_WINDOW_START_HOUR,
     DAILY_IMPORT_WINDOW_START_MINUTE,
+    DEFAULT_FETCH_CONCURRENCY,
     DEFAULT_IMAP_FOLDER,
     DEFAULT_IMAP_HOST,
     DEFAULT_IMAP_PORT,
     DEFAULT_IMAP_SENDER,
+    DEFAULT_KEEPALIVE_MINUTES,
     DEFAULT_PRICE_CURRENCY,
     DEFAULT_PROVIDER,
+    DEFAULT_SUB_HOURLY,
     DOMAIN,
     ENERGY_TYPE_MAP,
     EXPORT_BALANCE_KEY,
@@ -64,26 +86,57 @@ from .const import (
     IGNITIS_IMPORT_MINUTE,
     IGNITIS_MAX_RETRIES,
     IGNITIS_RETRY_DELAY_SECONDS,
+    IMPORT_METRICS_HISTORY,
+    LEGACY_SESSION_FILE,
+    PREVIOUS_SUM_LOOKBACK_DAYS,
     PROVIDER_IGNITIS,
     PROVIDERS,
     RETRY_DELAY_SECONDS,
     SERVICE_IMPORT_NOW,
-    SESSION_FILE,
+    SERVICE_IMPORT_RANGE,
+    SIGNAL_IMPORT_FINISHED,
     SUBENTRY_TYPE_OBJECT,
     TIMEZONE,
 )
-from .eso_client import ESOAuthError, ESOClient
-from .ignitis_client import IgnitisClient
+from .anchor_store import AnchorStore
+from .catch_up import async_last_imported_hours, missing_range
+from .eso_client import AsyncESOClient, ESOAuthError
+from .hourly_series import HourlySeries
+from .ignitis_client import AsyncIgnitisClient
+from .import_metrics import (
+    COUNTER_OBJECTS_FAILED,
+    COUNTER_OBJECTS_IMPORTED,
+    COUNTER_POINTS_WRITTEN,
+    COUNTER_RECORDER_QUERIES,
+    PHASE_LOGIN,
+    PHASE_PRICES,
+    PHASE_SUM_LOOKUP,
+    PHASE_WRITE,
+    ImportRun,
+    bind,
+    count,
+    import_run,
+    phase,
+)
+from .price_join import PriceJoin, join_prices
+from .session_store import SessionStore
+from .sum_rechain import async_rechain_sums
+from .tariff import Tariff
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = [Platform.SENSOR]
+
 
 @dataclass
 class ESORuntimeData:
     """Runtime data stored on the config entry."""
 
-    client: ESOClient | IgnitisClient
-    async_import: Callable[[datetime], Awaitable[None]]
+    client: AsyncESOClient | AsyncIgnitisClient
+    anchors: AnchorStore
+    async_import: Callable[[datetime], Awaitable[bool]]
+    async_import_range: Callable[[date, date], Awaitable[None]]
+    import_runs: deque[ImportRun]
 
 
 type ESOConfigEntry = ConfigEntry[ESORuntimeData]
@@ -97,6 +150,9 @@ OBJECT_SCHEMA = vol.Schema(
         vol.Optional(CONF_PRICE_ENTITY): cv.string,
         vol.Optional(CONF_PRICE_CURRENCY, default=DEFAULT_PRICE_CURRENCY): cv.string,
         vol.Optional(CONF_FIXED_PRICE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_NIGHT_PRICE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_DISTRIBUTION_FEE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_NIGHT_DISTRIBUTION_FEE): vol.All(vol.Coerce(float), vol.Range(min=0)),
         vol.Required(CONF_EXPORT_BALANCE, default=False): cv.boolean,
     }
 )
@@ -128,6 +184,13 @@ CONFIG_SCHEMA = vol.Schema(
 SERVICE_IMPORT_NOW_SCHEMA = vol.Schema(
     {vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]), vol.Optional(ATTR_DATE): cv.datetime}
 )
+SERVICE_IMPORT_RANGE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Required(ATTR_END_DATE): cv.date,
+    }
+)
 
 
 def _next_import_time(now: datetime, provider: str) -> datetime:
@@ -153,21 +216,8 @@ def _next_import_time(now: datetime, provider: str) -> datetime:
     return start + timedelta(seconds=random.randint(0, DAILY_IMPORT_WINDOW_SECONDS))
 
 
-def _expected_hourly_points(day: date) -> int:
-    tz = dt_util.get_time_zone(TIMEZONE)
-    start = datetime(day.year, day.month, day.day, tzinfo=tz)
-    nxt = start + timedelta(days=1)
-    return round((nxt.timestamp() - start.timestamp()) / 3600)
-
-
 def _need_retry(dataset: dict | None, target_day: date) -> bool:
-    if not dataset:
-        return True
-    expected = _expected_hourly_points(target_day)
-    for data_type in [CONF_CONSUMED, CONF_RETURNED]:
-        if len(dataset.get(ENERGY_TYPE_MAP[data_type], {})) < expected:
-            return True
-    return False
+    return not dataset or not AsyncIgnitisClient.day_complete(dataset, target_day)
 
 
 def _entry_objects(entry: ESOConfigEntry) -> list[dict]:
@@ -179,6 +229,45 @@ def _entry_objects(entry: ESOConfigEntry) -> list[dict]:
     ]
 
 
+async def _async_fetch_objects(
+    hass: HomeAssistant,
+    objects: list[dict],
+    fetch: Callable[[dict], Awaitable[dict | None]],
+    limit: int,
+) -> AsyncIterator[tuple[dict, dict | None, Exception | None]]:
+    """Run ``fetch`` for every object, at most ``limit`` at a time, and yield
+    ``(object, dataset, error)`` in completion order.
+
+    Fetches still pending when the generator is closed are cancelled, so
+    consumers close it (``contextlib.aclosing``) rather than leave that to
+    garbage collection when they stop early or raise.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(obj: dict) -> tuple[dict, dict | None, Exception | None]:
+        async with semaphore:
+            _LOGGER.info("Fetching ESO dataset [%s]", obj[CONF_NAME])
+            try:
+                return obj, await fetch(obj), None
+            except Exception as err:  # noqa: BLE001 - reported per object
+                return obj, None, err
+
+    tasks = [hass.async_create_task(run(obj)) for obj in objects]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _price_join(hass: HomeAssistant, objects: list[dict]) -> PriceJoin:
+    """Return the price join shared by all objects of one import run."""
+    return PriceJoin(
+        hass, {obj[CONF_PRICE_ENTITY] for obj in objects if obj.get(CONF_PRICE_ENTITY)}
+    )
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Import a legacy YAML configuration into a config entry."""
     if DOMAIN not in config:
@@ -207,10 +296,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ESOConfigEntry) -> bool:
     """Set up ESO from a config entry."""
     provider = entry.data.get(CONF_PROVIDER, DEFAULT_PROVIDER)
 
+    sub_hourly = entry.options.get(CONF_SUB_HOURLY, DEFAULT_SUB_HOURLY)
     if provider == PROVIDER_IGNITIS:
-        client: ESOClient | IgnitisClient = IgnitisClient(
+        client: AsyncESOClient | AsyncIgnitisClient = AsyncIgnitisClient(
+            hass,
             username=entry.data[CONF_USERNAME],
             password=entry.data[CONF_PASSWORD],
+            sub_hourly=sub_hourly,
         )
     else:
         if not entry.data.get(CONF_IMAP):
@@ -229,12 +321,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ESOConfigEntry) -> bool:
             "folder": imap_config_data.get(CONF_IMAP_FOLDER, DEFAULT_IMAP_FOLDER),
         }
 
-        client = ESOClient(
+        client = AsyncESOClient(
+            hass,
             username=entry.data[CONF_USERNAME],
             password=entry.data[CONF_PASSWORD],
             imap_config=imap_config,
-            session_file=hass.config.path(SESSION_FILE),
+            session_store=SessionStore(hass, entry.unique_id or entry.entry_id),
+            sub_hourly=sub_hourly,
         )
+        # The session was created for this entry only (own cookie jar); close
+        # it so reloads and option changes do not leak sessions.
+        entry.async_on_unload(client.async_close)
 
     retry_delay = (
         IGNITIS_RETRY_DELAY_SECONDS
@@ -242,61 +339,173 @@ async def async_setup_entry(hass: HomeAssistant, entry: ESOConfigEntry) -> bool:
         else RETRY_DELAY_SECONDS
     )
     max_retries = IGNITIS_MAX_RETRIES if provider == PROVIDER_IGNITIS else 1
-
-    async def async_import_generation(now: datetime, retry: int = 0) -> None:
+    fetch_concurrency = entry.options.get(CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY)
+    anchors = AnchorStore(hass, entry.entry_id)
+    await anchors.async_load()
+    import_runs: deque[ImportRun] = deque(maxlen=IMPORT_METRICS_HISTORY)
+    # IDs of the objects whose import of a target day failed and is retried.
+    # A retry only fetches these, on the session or token still held by the
+    # client, instead of importing the whole account again.
+    retry_queue: dict[date, set[str]] = {}
+    # Serialises the imports of this entry (daily, retries, catch-up and the
+    # services): they share the client, whose login resets its datasets, and
+    # the anchor store.
+    import_lock = asyncio.Lock()
+
+    def tracked(kind: str):
+        """Run each call of the decorated import under the entry's import
+        lock and record it as one import run."""
+
+        def decorate(import_fn):
+            async def run(*args, **kwargs):
+                async with import_lock:
+                    with import_run(kind, import_runs):
+                        result = await import_fn(*args, **kwargs)
+                async_dispatcher_send(hass, SIGNAL_IMPORT_FINISHED.format(entry.entry_id))
+                return result
+
+            return run
+
+        return decorate
+
+    @tracked("daily")
+    async def async_import_generation(now: datetime, retry: int = 0) -> bool:
+        """Import the day before ``now``; return False when the provider
+        rejected the credentials."""
         if hass.is_stopping:
             _LOGGER.debug("HA is stopping, skipping generation import")
-            return
+            return True
+        target_day = (now - timedelta(days=1)).date()
         objects = _entry_objects(entry)
-        all_failed = False
+        if retry:
+            queued = retry_queue.get(target_day, set())
+            objects = [obj for obj in objects if obj[CONF_ID] in queued]
+            if not objects:
+                _LOGGER.debug("No objects left to retry for %s", target_day)
+                return True
+            _LOGGER.info("Retrying %d object(s) for %s", len(objects), target_day)
+        prices = _price_join(hass, objects)
+        failed: set[str] = set()
         auth_failed = False
         try:
             _LOGGER.info("Logging in to %s...", provider.upper())
-            await hass.async_add_executor_job(client.login)
+            with phase(PHASE_LOGIN):
+                await client.async_login()
         except ESOAuthError as err:
             _LOGGER.error("Authentication failed: %s. Reconfigure the integration to update credentials.", err)
             auth_failed = True
         except Exception as err:
             _LOGGER.error("ESO login error: %s", err)
-            all_failed = True
-        for obj in objects if not auth_failed else []:
-            _LOGGER.info("Fetching ESO dataset [%s]", obj[CONF_NAME])
-            try:
-                await hass.async_add_executor_job(client.fetch_dataset, obj[CONF_ID], now)
-            except ESOAuthError as err:
-                _LOGGER.error("Authentication failed for %s: %s. Reconfigure the integration to update credentials.", obj[CONF_NAME], err)
-                auth_failed = True
-                break
-            except Exception as err:
-                _LOGGER.error("ESO fetch dataset error [%s]: %s", obj[CONF_NAME], err)
-                all_failed = True
-                continue
-            dataset = client.get_dataset(obj[CONF_ID])
-            target_day = (now - timedelta(days=1)).date()
-            if provider == PROVIDER_IGNITIS and _need_retry(dataset, target_day):
-                _LOGGER.warning("Received incomplete data for %s, will retry later", obj[CONF_NAME])
-                all_failed = True
-                continue
-            await async_insert_statistics(hass, obj, dataset)
-            if obj.get(CONF_PRICE_ENTITY):
-                await async_insert_cost_statistics(hass, obj, dataset)
-            elif obj.get(CONF_FIXED_PRICE) is not None:
-                await async_insert_fixed_price_cost_statistics(hass, obj, dataset)
-            if obj.get(CONF_EXPORT_BALANCE):
-                await async_insert_export_balance_statistics(hass, obj, dataset)
-            _LOGGER.info("Import completed for %s", obj[CONF_NAME])
-        if auth_failed:
-            return
-        if all_failed and retry < max_retries:
+            failed = {obj[CONF_ID] for obj in objects}
+        fetched = _async_fetch_objects(
+            hass,
+            objects if not (auth_failed or failed) else [],
+            lambda obj: client.async_fetch_dataset(obj[CONF_ID], now),
+            fetch_concurrency,
+        )
+        async with contextlib.aclosing(fetched):
+            async for obj, dataset, err in fetched:
+                if isinstance(err, ESOAuthError):
+                    _LOGGER.error("Authentication failed for %s: %s. Reconfigure the integration to update credentials.", obj[CONF_NAME], err)
+                    auth_failed = True
+                    break
+                if err is not None:
+                    _LOGGER.error("ESO fetch dataset error [%s]: %s", obj[CONF_NAME], err)
+                    count(COUNTER_OBJECTS_FAILED)
+                    failed.add(obj[CONF_ID])
+                    continue
+                if not dataset or (provider == PROVIDER_IGNITIS and _need_retry(dataset, target_day)):
+                    _LOGGER.warning("Received no or incomplete data for %s, will retry later", obj[CONF_NAME])
+                    count(COUNTER_OBJECTS_FAILED)
+                    failed.add(obj[CONF_ID])
+                    continue
+                await async_insert_object_statistics(hass, obj, dataset, anchors, prices)
+                count(COUNTER_OBJECTS_IMPORTED)
+                _LOGGER.info("Import completed for %s", obj[CONF_NAME])
+        if auth_failed or not failed:
+            retry_queue.pop(target_day, None)
+            return not auth_failed
+        if retry < max_retries:
+            retry_queue[target_day] = failed
             retry_at = dt_util.now() + timedelta(seconds=retry_delay)
-            _LOGGER.warning("Fetch failed, will retry at %s (attempt %d/%d)", retry_at.isoformat(), retry + 1, max_retries)
+            _LOGGER.warning(
+                "Fetch failed for %d of %d object(s), will retry them at %s (attempt %d/%d)",
+                len(failed),
+                len(objects),
+                retry_at.isoformat(),
+                retry + 1,
+                max_retries,
+            )
 
             async def _retry(_now: datetime) -> None:
                 await async_import_generation(now, retry=retry + 1)
 
             entry.async_on_unload(async_call_later(hass, retry_delay, _retry))
-        elif all_failed:
-            _LOGGER.error("Fetch failed, postponing fetch for next day")
+        else:
+            retry_queue.pop(target_day, None)
+            _LOGGER.error("Fetch failed for %d object(s), postponing fetch for next day", len(failed))
+        return True
+
+    @tracked("range")
+    async def async_import_range(start: date, end: date) -> None:
+        """Backfill ``start``..``end`` (inclusive) with a single login."""
+        if hass.is_stopping:
+            _LOGGER.debug("HA is stopping, skipping range import")
+            return
+        try:
+            _LOGGER.info("Logging in to %s...", provider.upper())
+            with phase(PHASE_LOGIN):
+                await client.async_login()
+        except ESOAuthError as err:
+            _LOGGER.error("Authentication failed: %s. Reconfigure the integration to update credentials.", err)
+            return
+        except Exception as err:
+            _LOGGER.error("ESO login error: %s", err)
+            return
+        objects = _entry_objects(entry)
+        prices = _price_join(hass, objects)
+        _LOGGER.info("Fetching ESO datasets for %s..%s", start, end)
+        fetched = _async_fetch_objects(
+            hass,
+            objects,
+            lambda obj: client.async_fetch_range_dataset(obj[CONF_ID], start, end),
+            fetch_concurrency,
+        )
+        async with contextlib.aclosing(fetched):
+            async for obj, dataset, err in fetched:
+                if isinstance(err, ESOAuthError):
+                    _LOGGER.error("Authentication failed for %s: %s. Reconfigure the integration to update credentials.", obj[CONF_NAME], err)
+                    return
+                if err is not None:
+                    _LOGGER.error("ESO fetch dataset error [%s]: %s", obj[CONF_NAME], err)
+                    count(COUNTER_OBJECTS_FAILED)
+                    continue
+                await async_insert_object_statistics(hass, obj, dataset, anchors, prices)
+                count(COUNTER_OBJECTS_IMPORTED)
+                _LOGGER.info("Range import completed for %s", obj[CONF_NAME])
+
+    async def async_catch_up(through: date) -> None:
+        """Import the days missing from any statistic up to ``through``.
+
+        Days still waiting for a scheduled retry are left to that retry.
+        """
+        if hass.is_stopping:
+            return
+        statistic_ids = [
+            statistic_id
+            for obj in _entry_objects(entry)
+            for statistic_id in _energy_statistic_ids(obj).values()
+        ]
+        yesterday = through
+        while yesterday in retry_queue:
+            yesterday -= timedelta(days=1)
+        last_hours = await async_last_imported_hours(hass, anchors, statistic_ids)
+        gap = missing_range(last_hours, yesterday)
+        if gap is None:
+            _LOGGER.debug("Statistics are complete through %s", yesterday)
+            return
+        _LOGGER.info("Missing data from %s to %s, importing it", *gap)
+        await async_import_range(*gap)
 
     daily_import_cancel = None
 
@@ -315,18 +524,60 @@ async def async_setup_entry(hass: HomeAssistant, entry: ESOConfigEntry) -> bool:
     async def async_run_scheduled_import(now: datetime) -> None:
         nonlocal daily_import_cancel
         daily_import_cancel = None
-        await async_import_generation(now)
+        if await async_import_generation(now):
+            # Yesterday was just imported (or is queued for a retry); ESO may
+            # simply not have all of it yet, which is no reason for a second
+            # login the same morning.
+            await async_catch_up((now - timedelta(days=2)).date())
+        else:
+            _LOGGER.debug("Credentials rejected, skipping catch-up")
         if not hass.is_stopping:
             schedule_daily_import(now)
 
     schedule_daily_import(dt_util.now())
     entry.async_on_unload(lambda: daily_import_cancel and daily_import_cancel())
+
+    @callback
+    def catch_up_on_start(_hass: HomeAssistant) -> None:
+        now = dt_util.now()
+        through = (now - timedelta(days=1)).date()
+        if _next_import_time(now, provider).date() == now.date():
+            # Today's scheduled import still fetches yesterday; catching it
+            # up now would only add a login (and an ESO email code).
+            through -= timedelta(days=1)
+        entry.async_create_background_task(
+            hass, async_catch_up(through), "eso_catch_up"
+        )
+
+    entry.async_on_unload(async_at_started(hass, catch_up_on_start))
+
+    keepalive_minutes = entry.options.get(CONF_KEEPALIVE_MINUTES, DEFAULT_KEEPALIVE_MINUTES)
+    if isinstance(client, AsyncESOClient) and keepalive_minutes:
+
+        async def async_keep_alive(_now: datetime) -> None:
+            if hass.is_stopping:
+                return
+            alive = await client.async_keep_alive()
+            _LOGGER.debug("ESO session keep-alive, session alive: %s", alive)
+
+        entry.async_create_background_task(
+            hass, client.async_restore_session(), "eso_restore_session"
+        )
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, async_keep_alive, timedelta(minutes=keepalive_minutes)
+            )
+        )
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     entry.runtime_data = ESORuntimeData(
         client=client,
+        anchors=anchors,
         async_import=async_import_generation,
+        async_import_range=async_import_range,
+        import_runs=import_runs,
     )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     _async_register_services(hass)
     return True
 
@@ -336,7 +587,7 @@ def _async_register_services(hass: HomeAssistant) -> None:
     if hass.services.has_service(DOMAIN, SERVICE_IMPORT_NOW):
         return
 
-    async def async_handle_import_now(call: ServiceCall) -> None:
+    def target_entries(call: ServiceCall) -> list[ESOConfigEntry]:
         entries: list[ESOConfigEntry] = hass.config_entries.async_loaded_entries(DOMAIN)
         by_id = {entry.entry_id: entry for entry in entries}
         entry_ids = call.data.get(ATTR_CONFIG_ENTRY_ID)
@@ -346,19 +597,21 @@ def _async_register_services(hass: HomeAssistant) -> None:
                 raise ServiceValidationError(
                     f"Unknown ESO config entry id(s): {', '.join(unknown)}"
                 )
-            targets = [by_id[eid].runtime_data.async_import for eid in entry_ids]
-        else:
-            targets = [entry.runtime_data.async_import for entry in entries]
-        if not targets:
+            entries = [by_id[eid] for eid in entry_ids]
+        if not entries:
             raise ServiceValidationError("No ESO accounts are configured")
+        return entries
+
+    async def async_handle_import_now(call: ServiceCall) -> None:
+        targets = [entry.runtime_data.async_import for entry in target_entries(call)]
         reference = call.data.get(ATTR_DATE)
         if reference is None:
             reference = dt_util.now()
         elif reference.tzinfo is None:
             reference = reference.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
         _LOGGER.info("ESO: on-demand import requested for %d account(s) as of %s", len(targets), reference.isoformat())
-        for callback in targets:
-            await callback(reference)
+        for import_fn in targets:
+            await import_fn(reference)
 
     hass.services.async_register(
         DOMAIN,
@@ -367,31 +620,116 @@ def _async_register_services(hass: HomeAssistant) -> None:
         schema=SERVICE_IMPORT_NOW_SCHEMA,
     )
 
+    async def async_handle_import_range(call: ServiceCall) -> None:
+        start = call.data[ATTR_START_DATE]
+        end = call.data[ATTR_END_DATE]
+        if start > end:
+            raise ServiceValidationError("The start date must not be after the end date")
+        targets = [entry.runtime_data.async_import_range for entry in target_entries(call)]
+        _LOGGER.info("ESO: range import requested for %d account(s) from %s to %s", len(targets), start, end)
+        for import_fn in targets:
+            await import_fn(start, end)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_RANGE,
+        async_handle_import_range,
+        schema=SERVICE_IMPORT_RANGE_SCHEMA,
+    )
+
 
 async def async_unload_entry(hass: HomeAssistant, entry: ESOConfigEntry) -> bool:
     """Unload a config entry (scheduling is torn down via async_on_unload)."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
     remaining = [
         other
         for other in hass.config_entries.async_loaded_entries(DOMAIN)
         if other.entry_id != entry.entry_id
     ]
-    if not remaining and hass.services.has_service(DOMAIN, SERVICE_IMPORT_NOW):
-        hass.services.async_remove(DOMAIN, SERVICE_IMPORT_NOW)
+    if not remaining:
+        for service in (SERVICE_IMPORT_NOW, SERVICE_IMPORT_RANGE):
+            if hass.services.has_service(DOMAIN, service):
+                hass.services.async_remove(DOMAIN, service)
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ESOConfigEntry) -> bool:
+    """Migrate a config entry from an older version."""
+    if entry.version > 1:
+        return False
+    if entry.minor_version < 2:
+        # Sessions moved from the shared file to a store per account.
+        await hass.async_add_executor_job(
+            _remove_legacy_session_file, hass.config.path(LEGACY_SESSION_FILE)
+        )
+        hass.config_entries.async_update_entry(entry, minor_version=2)
+    return True
+
+
+def _remove_legacy_session_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as err:
+        _LOGGER.warning("Could not remove the old ESO session file %s: %s", path, err)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ESOConfigEntry) -> None:
+    """Drop the persisted sum anchors and session of a removed config entry."""
+    await AnchorStore(hass, entry.entry_id).async_remove()
+    await SessionStore(hass, entry.unique_id or entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ESOConfigEntry) -> None:
     """Reload the config entry when its options change."""
     await hass.config_entries.async_reload(entry.entry_id)
 
 
-async def async_insert_statistics(
-    hass: HomeAssistant, obj: dict, dataset: dict
+async def async_insert_object_statistics(
+    hass: HomeAssistant,
+    obj: dict,
+    dataset: dict,
+    anchors: AnchorStore,
+    prices: PriceJoin,
 ) -> None:
-    for data_type in [CONF_CONSUMED, CONF_RETURNED]:
-        if obj.get(data_type) is False:
-            continue
-        statistic_id = f"{DOMAIN}:energy_{data_type}_{obj[CONF_ID]}"
+    """Import every statistic configured for an object from one dataset."""
+    series = _energy_series(obj, dataset)
+    if obj.get(CONF_PRICE_ENTITY):
+        with phase(PHASE_PRICES):
+            series += await _async_price_cost_series(obj, dataset, prices)
+    elif obj.get(CONF_FIXED_PRICE) is not None:
+        series += _tariff_cost_series(obj, dataset)
+    await async_write_series(hass, series, anchors)
+    if obj.get(CONF_EXPORT_BALANCE):
+        await async_insert_export_balance_statistics(hass, obj, dataset)
+
+
+@dataclass
+class SeriesWrite:
+    """A cumulative series to import: its metadata and hourly states."""
+
+    metadata: StatisticMetaData
+    rows: HourlySeries
+
+
+def _hour_start(ts: float) -> datetime:
+    return dt_util.utc_from_timestamp(ts)
+
+
+def _energy_statistic_ids(obj: dict) -> dict[str, str]:
+    """Return the energy statistic ID of each data type imported for ``obj``."""
+    return {
+        data_type: f"{DOMAIN}:energy_{data_type}_{obj[CONF_ID]}"
+        for data_type in [CONF_CONSUMED, CONF_RETURNED]
+        if obj.get(data_type) is not False
+    }
+
+
+def _energy_series(obj: dict, dataset: dict) -> list[SeriesWrite]:
+    series: list[SeriesWrite] = []
+    for data_type, statistic_id in _energy_statistic_ids(obj).items():
         _LOGGER.debug("Statistic ID for %s is %s", obj[CONF_NAME], statistic_id)
         mapped_consumption_type = ENERGY_TYPE_MAP[data_type]
         if not dataset or mapped_consumption_type not in dataset:
@@ -408,140 +746,75 @@ async def async_insert_statistics(
             unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
             unit_class="energy",
         )
-        _LOGGER.debug("Preparing long-term statistics for %s", statistic_id)
-        statistics = await _async_get_statistics(hass, metadata, generation_data)
-        _LOGGER.debug("Generated statistics for %s: %s", statistic_id, statistics)
-        async_add_external_statistics(hass, metadata, statistics)
-
-
-async def _async_get_statistics(
-    hass: HomeAssistant,
-    metadata: StatisticMetaData,
-    generation_data: dict,
-) -> list[StatisticData]:
-    statistics: list[StatisticData] = []
-    sum_ = None
-    for ts, kwh in generation_data.items():
-        dt_object = datetime.fromtimestamp(ts).replace(
-            tzinfo=dt_util.get_time_zone(TIMEZONE)
-        )
-        if sum_ is None:
-            sum_ = await get_previous_sum(hass, metadata, dt_object)
-        sum_ += kwh
-        statistics.append(
-            StatisticData(
-                start=dt_object,
-                state=kwh,
-                sum=sum_,
-            )
-        )
-    return statistics
+        series.append(SeriesWrite(metadata, generation_data))
+    return series
 
 
-async def get_previous_sum(
-    hass: HomeAssistant,
-    metadata: StatisticMetaData,
-    date: datetime,
-) -> float:
-    # Look back far enough to survive multi-day fetch failures and take the most
-    # recent point before `date`. A 1-hour lookup silently resets the cumulative
-    # sum to 0 whenever a gap appears, which corrupts the long-term statistics.
-    statistic_id = metadata["statistic_id"]
-    start = date - timedelta(days=60)
-    end = date
-    _LOGGER.debug(
-        "Looking history sum for %s for %s between %s and %s",
-        statistic_id,
-        date,
-        start,
-        end,
-    )
-    stat = await get_instance(hass).async_add_executor_job(
-        statistics_during_period,
-        hass,
-        start,
-        end,
-        {statistic_id},
-        "hour",
-        None,
-        {"sum"},
-    )
-    rows = stat.get(statistic_id) if stat else None
-    if not rows:
-        _LOGGER.debug("No history sum found")
-        return 0.0
-    sum_ = rows[-1].get("sum") or 0.0
-    _LOGGER.debug("History sum for %s = %s", statistic_id, sum_)
-    return sum_
-
-
-async def async_insert_cost_statistics(
-    hass: HomeAssistant,
+async def _async_price_cost_series(
     obj: dict,
     consumption_dataset: dict,
-) -> None:
+    prices: PriceJoin,
+) -> list[SeriesWrite]:
     if obj.get(CONF_CONSUMED) is False:
-        return
+        return []
     series = consumption_dataset.get(ENERGY_TYPE_MAP[CONF_CONSUMED])
     if not series:
-        return
-    start_time = datetime.fromtimestamp(min(series.keys())).replace(
-        tzinfo=dt_util.get_time_zone(TIMEZONE)
-    )
-    end_time = datetime.fromtimestamp(max(series.keys())).replace(
-        tzinfo=dt_util.get_time_zone(TIMEZONE)
-    )
-    prices = await _async_generate_price_dict(hass, obj, start_time, end_time)
-
-    def price_for(ts: float) -> float:
-        return prices.get(ts, 0)
-
-    await _async_insert_cost_series(
-        hass,
-        obj,
-        f"{DOMAIN}:energy_{CONF_COST}_{obj[CONF_ID]}",
-        f"{obj[CONF_NAME]} ({CONF_COST})",
-        series,
-        price_for,
-    )
+        return []
+    price_entity = obj[CONF_PRICE_ENTITY]
+    price_series = await prices.async_prices(price_entity, series.first, series.last)
+    price_series = Tariff.from_object(obj).with_fees(price_series)
+    cost, unmatched = join_prices(series, price_series)
+    if unmatched:
+        _LOGGER.warning(
+            "No %s price for %d of %d hours of %s (first %s, last %s); their cost is left out until a price is available",
+            price_entity,
+            len(unmatched),
+            len(series),
+            obj[CONF_NAME],
+            _hour_start(unmatched[0]).isoformat(),
+            _hour_start(unmatched[-1]).isoformat(),
+        )
+    return [
+        _cost_series(
+            obj,
+            f"{DOMAIN}:energy_{CONF_COST}_{obj[CONF_ID]}",
+            f"{obj[CONF_NAME]} ({CONF_COST})",
+            cost,
+        )
+    ]
 
 
-async def async_insert_fixed_price_cost_statistics(
-    hass: HomeAssistant,
+def _tariff_cost_series(
     obj: dict,
     consumption_dataset: dict,
-) -> None:
-    fixed_price = obj.get(CONF_FIXED_PRICE)
-    if fixed_price is None:
-        return
-
-    def price_for(ts: float) -> float:
-        return fixed_price
-
+) -> list[SeriesWrite]:
+    if obj.get(CONF_FIXED_PRICE) is None:
+        return []
+    tariff = Tariff.from_object(obj)
+    cost_series: list[SeriesWrite] = []
     for data_type in [CONF_CONSUMED, CONF_RETURNED]:
         if obj.get(data_type) is False:
             continue
         series = consumption_dataset.get(ENERGY_TYPE_MAP[data_type])
         if not series:
             continue
-        await _async_insert_cost_series(
-            hass,
-            obj,
-            f"{DOMAIN}:energy_{CONF_COST}_{data_type}_{obj[CONF_ID]}",
-            f"{obj[CONF_NAME]} {data_type} ({CONF_COST})",
-            series,
-            price_for,
+        cost_series.append(
+            _cost_series(
+                obj,
+                f"{DOMAIN}:energy_{CONF_COST}_{data_type}_{obj[CONF_ID]}",
+                f"{obj[CONF_NAME]} {data_type} ({CONF_COST})",
+                tariff.cost(series, include_fees=data_type == CONF_CONSUMED),
+            )
         )
+    return cost_series
 
 
-async def _async_insert_cost_series(
-    hass: HomeAssistant,
+def _cost_series(
     obj: dict,
     statistic_id: str,
     name: str,
-    series: dict,
-    price_for: Callable[[float], float],
-) -> None:
+    rows: HourlySeries,
+) -> SeriesWrite:
     cost_metadata = StatisticMetaData(
         has_sum=True,
         mean_type=StatisticMeanType.NONE,
@@ -551,23 +824,106 @@ async def _async_insert_cost_series(
         unit_of_measurement=obj.get(CONF_PRICE_CURRENCY, DEFAULT_PRICE_CURRENCY),
         unit_class=None,
     )
-    cost_stats: list[StatisticData] = []
-    cost_sum_ = None
-    for ts, kwh in series.items():
-        dt_object = datetime.fromtimestamp(ts).replace(
-            tzinfo=dt_util.get_time_zone(TIMEZONE)
+    return SeriesWrite(cost_metadata, rows)
+
+
+async def async_write_series(
+    hass: HomeAssistant, series_list: list[SeriesWrite], anchors: AnchorStore
+) -> None:
+    """Write the new or changed hours of each series.
+
+    Hours whose value matches what the anchor window says was already
+    imported are skipped; writing starts at the first hour that is new or
+    differs. Its previous sum comes from the anchor where possible, otherwise
+    all remaining series are resolved with one recorder job. When the write
+    may end before rows already in the recorder, their sums are re-chained.
+    """
+    plans: dict[str, tuple[SeriesWrite, float, float | None]] = {}
+    befores: dict[str, datetime] = {}
+    for series in series_list:
+        statistic_id = series.metadata["statistic_id"]
+        start_ts, previous_sum = anchors.plan(statistic_id, series.rows)
+        if start_ts is None:
+            _LOGGER.debug("No new or changed hours for %s", statistic_id)
+            continue
+        plans[statistic_id] = (series, start_ts, previous_sum)
+        if previous_sum is None:
+            befores[statistic_id] = _hour_start(start_ts)
+    with phase(PHASE_SUM_LOOKUP):
+        recorder_sums = await async_get_previous_sums(hass, befores) if befores else {}
+    for statistic_id, (series, start_ts, previous_sum) in plans.items():
+        rows = series.rows.clip(start_ts)
+        sum_ = recorder_sums[statistic_id] if previous_sum is None else previous_sum
+        statistics: list[StatisticData] = []
+        for ts, state in rows.items():
+            sum_ += state
+            statistics.append(StatisticData(start=_hour_start(ts), state=state, sum=sum_))
+        _LOGGER.debug(
+            "Generated statistics for %s (%d of %d hours changed): %s",
+            statistic_id,
+            len(rows),
+            len(series.rows),
+            statistics,
         )
-        cost = round(kwh * price_for(ts), 5)
-        if cost_sum_ is None:
-            cost_sum_ = await get_previous_sum(hass, cost_metadata, dt_object)
-        cost_sum_ += cost
-        cost_stats.append(StatisticData(start=dt_object, state=cost, sum=cost_sum_))
-    _LOGGER.debug(
-        "Generated cost statistics for %s: %s",
-        statistic_id,
-        cost_stats,
+        newest = anchors.is_newest(statistic_id, rows.last)
+        with phase(PHASE_WRITE):
+            async_add_external_statistics(hass, series.metadata, statistics)
+            count(COUNTER_POINTS_WRITTEN, len(statistics))
+            anchors.async_record(statistic_id, rows, sum_)
+            if not newest:
+                await async_rechain_sums(hass, series.metadata, statistics[-1]["start"], sum_)
+
+
+async def async_get_previous_sums(
+    hass: HomeAssistant,
+    befores: dict[str, datetime],
+) -> dict[str, float]:
+    """Return the most recent cumulative sum before the given time per statistic ID.
+
+    All IDs are resolved inside one recorder job. IDs without any history
+    resolve to 0.
+    """
+    _LOGGER.debug("Looking history sums before %s", befores)
+    sums = await get_instance(hass).async_add_executor_job(
+        bind(_get_previous_sums), hass, befores
     )
-    async_add_external_statistics(hass, cost_metadata, cost_stats)
+    _LOGGER.debug("History sums: %s", sums)
+    return sums
+
+
+def _get_previous_sums(
+    hass: HomeAssistant,
+    befores: dict[str, datetime],
+) -> dict[str, float]:
+    # Look back far enough to survive multi-day fetch failures and take the most
+    # recent point before `before`. A 1-hour lookup silently resets the cumulative
+    # sum to 0 whenever a gap appears, which corrupts the long-term statistics.
+    # The short window answers the usual daily case from a handful of rows; only
+    # IDs it cannot resolve are looked up over the full window.
+    by_before: dict[datetime, set[str]] = {}
+    for statistic_id, before in befores.items():
+        by_before.setdefault(before, set()).add(statistic_id)
+    sums: dict[str, float] = {}
+    for before, statistic_ids in by_before.items():
+        remaining = set(statistic_ids)
+        for lookback_days in PREVIOUS_SUM_LOOKBACK_DAYS:
+            stats = statistics_during_period(
+                hass,
+                before - timedelta(days=lookback_days),
+                before,
+                remaining,
+                "hour",
+                None,
+                {"sum"},
+            )
+            count(COUNTER_RECORDER_QUERIES)
+            for statistic_id, rows in (stats or {}).items():
+                if rows:
+                    sums[statistic_id] = rows[-1].get("sum") or 0.0
+            remaining -= sums.keys()
+            if not remaining:
+                break
+    return {statistic_id: sums.get(statistic_id, 0.0) for statistic_id in befores}
 
 
 async def async_insert_export_balance_statistics(
@@ -590,52 +946,20 @@ async def async_insert_export_balance_statistics(
         unit_class="energy",
     )
     tz = dt_util.get_time_zone(TIMEZONE)
-    timestamps = list(consumption_dataset.get(ENERGY_TYPE_MAP[CONF_CONSUMED], {}))
-    timestamps += list(consumption_dataset.get(ENERGY_TYPE_MAP[CONF_RETURNED], {}))
+    timestamps = [
+        series.last
+        for data_type in [CONF_CONSUMED, CONF_RETURNED]
+        if (series := consumption_dataset.get(ENERGY_TYPE_MAP[data_type]))
+    ]
     if timestamps:
-        start = datetime.fromtimestamp(max(timestamps)).replace(tzinfo=tz)
+        start = _hour_start(max(timestamps))
     else:
         start = datetime.now(tz=tz).replace(
             minute=0, second=0, microsecond=0
         ) - timedelta(hours=1)
     statistics = [StatisticData(start=start, state=balance, sum=balance)]
     _LOGGER.debug("Generated export balance statistics for %s: %s", statistic_id, statistics)
-    async_add_external_statistics(hass, metadata, statistics)
-
+    with phase(PHASE_WRITE):
+        async_add_external_statistics(hass, metadata, statistics)
+        count(COUNTER_POINTS_WRITTEN, len(statistics))
 
-async def _async_generate_price_dict(
-    hass: HomeAssistant,
-    obj: dict,
-    time_from: datetime,
-    time_to: datetime,
-) -> dict:
-    stats = await get_instance(hass).async_add_executor_job(
-        statistics_during_period,
-        hass,
-        time_from,
-        time_to,
-        {obj[CONF_PRICE_ENTITY]},
-        "hour",
-        None,
-        {"state"},
-    )
-    price_stats = stats.get(obj[CONF_PRICE_ENTITY])
-    if price_stats is None:
-        _LOGGER.warning(
-            "No price statistics for %s between %s and %s",
-            obj[CONF_PRICE_ENTITY],
-            time_from.isoformat(),
-            time_to.isoformat(),
-        )
-        return {}
-    _LOGGER.debug(
-        "Retrieving price statistics for %s between %s and %s: %s",
-        obj[CONF_PRICE_ENTITY],
-        time_from,
-        time_to,
-        price_stats,
-    )
-    prices = {}
-    for rec in price_stats:
-        prices[rec["start"]] = rec["state"]
-    return prices
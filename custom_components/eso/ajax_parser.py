@@ -0,0 +1,63 @@
+"""Targeted extraction from the ESO consumption ``drupal_ajax`` response.
+
+The response is a JSON list of Drupal AJAX commands. Next to the ``settings``
+command carrying ``graphics_data`` and the ``update_build_id`` command it holds
+``insert`` commands with the rendered HTML of the whole form, which is most of
+the payload. Only the two needed values are located in the text and decoded
+with ``raw_decode``; the HTML strings are never turned into Python objects.
+
+Inside JSON strings every quote is escaped, so an unescaped ``"key":`` can only
+be an object key. Should the response not have the expected shape (including
+an ``update_build_id`` command whose ``"command"`` key is not first), the whole
+list is decoded and filtered instead.
+"""
+
+import json
+import logging
+import re
+
+_LOGGER = logging.getLogger(__name__)
+
+FORM_SETTINGS_KEY = "eso_consumption_history_form"
+
+_DECODER = json.JSONDecoder()
+_FORM_SETTINGS = re.compile(r'(?<!\\)"' + FORM_SETTINGS_KEY + r'"\s*:\s*')
+_UPDATE_BUILD_ID = re.compile(r'\{\s*"command"\s*:\s*"update_build_id"\s*,')
+
+
+def extract_commands(text: str) -> list:
+    """Return the ``settings`` and ``update_build_id`` commands of a
+    consumption response, reduced to the parts the client reads."""
+    try:
+        return _extract_targeted(text)
+    except ValueError as e:
+        _LOGGER.debug("Targeted AJAX extraction failed (%s), decoding whole response", e)
+    return _filter_commands(json.loads(text))
+
+
+def _extract_targeted(text: str) -> list:
+    commands = []
+    match = _UPDATE_BUILD_ID.search(text)
+    if match:
+        command, _ = _DECODER.raw_decode(text, match.start())
+        commands.append(command)
+    elif '"update_build_id"' in text:
+        # Keys in another order; missing it would post a stale form_build_id.
+        raise ValueError("update_build_id command not in the expected shape")
+    match = _FORM_SETTINGS.search(text)
+    if match:
+        form, _ = _DECODER.raw_decode(text, match.end())
+        if form and "graphics_data" not in form:
+            raise ValueError("form settings without graphics_data")
+        commands.append({"command": "settings", "settings": {FORM_SETTINGS_KEY: form}})
+    elif not text.lstrip().startswith("["):
+        raise ValueError("not a command list")
+    return commands
+
+
+def _filter_commands(data: list) -> list:
+    return [
+        d
+        for d in data
+        if isinstance(d, dict) and d.get("command") in ("settings", "update_build_id")
+    ]
@@ -0,0 +1,121 @@
+"""Persisted cumulative-sum anchors for the imported external statistics.
+
+Every cumulative series needs the ``sum`` of the hour preceding the first hour
+being written. Instead of asking the recorder on each import, the last written
+hour, its cumulative sum and the values of the trailing hours are kept per
+statistic ID in a ``Store``. The value window lets an import skip the hours it
+already wrote (ESO returns a whole week on every fetch) and still derive the sum
+before the first hour that is new or changed. The anchor is only trusted while
+it is the newest row of the series: an import that ends before the anchored hour
+(a backfill) drops it and the next import falls back to the recorder.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ANCHOR_SAVE_DELAY_SECONDS,
+    ANCHOR_STORAGE_KEY,
+    ANCHOR_STORAGE_VERSION,
+    ANCHOR_WINDOW_HOURS,
+)
+from .hourly_series import HOUR_SECONDS, HourlySeries
+
+_LOGGER = logging.getLogger(__name__)
+
+# Values closer than this are considered unchanged (costs are rounded to 5
+# decimals, provider readings to 3).
+VALUE_TOLERANCE = 1e-6
+
+
+class AnchorStore:
+    """Last written hour (epoch), its cumulative sum and the trailing hourly
+    values (oldest first, ``None`` for holes), keyed by statistic ID."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, dict]] = Store(
+            hass, ANCHOR_STORAGE_VERSION, f"{ANCHOR_STORAGE_KEY}.{entry_id}"
+        )
+        self._anchors: dict[str, dict] = {}
+
+    async def async_load(self) -> None:
+        self._anchors = await self._store.async_load() or {}
+
+    async def async_remove(self) -> None:
+        self._anchors = {}
+        await self._store.async_remove()
+
+    def plan(
+        self, statistic_id: str, rows: HourlySeries
+    ) -> tuple[float | None, float | None]:
+        """Return where to start writing an hourly series.
+
+        The result is ``(start, previous_sum)``: the epoch of the first hour
+        that is new or differs from the anchor window and the cumulative sum
+        before it, or ``None`` for the sum when the recorder has to be asked.
+        ``start`` is ``None`` when every hour was already imported unchanged.
+        """
+        anchor = self._anchors.get(statistic_id)
+        if anchor is None:
+            return rows.first, None
+        last = anchor["start"]
+        values = anchor.get("values", [])
+        first_tracked = last - (len(values) - 1) * HOUR_SECONDS
+        for ts, state in rows.items():
+            if ts > last:
+                return ts, anchor["sum"]
+            if ts < first_tracked:
+                return ts, None
+            position = round((ts - first_tracked) / HOUR_SECONDS)
+            tracked = values[position]
+            if tracked is None or abs(tracked - state) > VALUE_TOLERANCE:
+                later = sum(value for value in values[position:] if value is not None)
+                return ts, anchor["sum"] - later
+        return None, None
+
+    def last_hour(self, statistic_id: str) -> float | None:
+        """Return the epoch of the last written hour, if anchored."""
+        anchor = self._anchors.get(statistic_id)
+        return None if anchor is None else anchor["start"]
+
+    def is_newest(self, statistic_id: str, ts: float | None) -> bool:
+        """Return True if the anchor proves no row exists after ``ts``."""
+        anchor = self._anchors.get(statistic_id)
+        return anchor is not None and ts is not None and anchor["start"] <= ts
+
+    @callback
+    def async_record(
+        self, statistic_id: str, rows: HourlySeries, last_sum: float
+    ) -> None:
+        """Move the anchor to the last hour of the series just written."""
+        first, last = rows.first, rows.last
+        if first is None or last is None:
+            return
+        anchor = self._anchors.get(statistic_id)
+        if anchor is not None and last < anchor["start"]:
+            # Later rows already in the recorder no longer chain from what we
+            # just wrote, so the anchor cannot be trusted any more.
+            _LOGGER.debug("Backfill before anchor of %s, invalidating it", statistic_id)
+            del self._anchors[statistic_id]
+        else:
+            known: dict[float, float | None] = {}
+            if anchor is not None:
+                values = anchor.get("values", [])
+                first_tracked = anchor["start"] - (len(values) - 1) * HOUR_SECONDS
+                for position, value in enumerate(values):
+                    ts = first_tracked + position * HOUR_SECONDS
+                    if ts < first:
+                        known[ts] = value
+            known.update(rows.items())
+            window_start = max(min(known), last - (ANCHOR_WINDOW_HOURS - 1) * HOUR_SECONDS)
+            hours = round((last - window_start) / HOUR_SECONDS) + 1
+            self._anchors[statistic_id] = {
+                "start": last,
+                "sum": last_sum,
+                "values": [known.get(window_start + hour * HOUR_SECONDS) for hour in range(hours)],
+            }
+        self._store.async_delay_save(lambda: self._anchors, ANCHOR_SAVE_DELAY_SECONDS)
@@ -0,0 +1,90 @@
+"""Detection of days missing from the imported statistics.
+
+When Home Assistant is down during the daily import window, or every retry of
+a day fails, that day would stay empty until someone imports it by hand. On
+startup and after each daily import the last imported hour of every configured
+statistic ID is looked up (from the sum anchors, falling back to the recorder)
+and the local days after it up to yesterday are reported as one range, which
+the caller imports with a single batched range fetch per object.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import get_last_statistics
+from homeassistant.core import HomeAssistant
+
+from .anchor_store import AnchorStore
+from .const import CATCH_UP_MAX_DAYS, TIMEZONE
+from .hour_grid import day_bounds
+from .hourly_series import HOUR_SECONDS
+from .import_metrics import COUNTER_RECORDER_QUERIES, bind, count
+
+_TZ = ZoneInfo(TIMEZONE)
+
+
+async def async_last_imported_hours(
+    hass: HomeAssistant, anchors: AnchorStore, statistic_ids: Iterable[str]
+) -> dict[str, float | None]:
+    """Return the epoch of the last imported hour per statistic ID.
+
+    Anchored IDs are answered from the anchor store; the others are looked up
+    in one recorder job. IDs without any rows resolve to ``None``.
+    """
+    last_hours: dict[str, float | None] = {}
+    unanchored: list[str] = []
+    for statistic_id in statistic_ids:
+        last = anchors.last_hour(statistic_id)
+        if last is None:
+            unanchored.append(statistic_id)
+        else:
+            last_hours[statistic_id] = last
+    if unanchored:
+        last_hours.update(
+            await get_instance(hass).async_add_executor_job(
+                bind(_get_last_hours), hass, unanchored
+            )
+        )
+    return last_hours
+
+
+def _get_last_hours(hass: HomeAssistant, statistic_ids: list[str]) -> dict[str, float | None]:
+    last_hours: dict[str, float | None] = {}
+    for statistic_id in statistic_ids:
+        stats = get_last_statistics(hass, 1, statistic_id, False, {"sum"})
+        count(COUNTER_RECORDER_QUERIES)
+        rows = (stats or {}).get(statistic_id)
+        last_hours[statistic_id] = rows[0]["start"] if rows else None
+    return last_hours
+
+
+def _first_missing_day(last_hour: float) -> date:
+    day = datetime.fromtimestamp(last_hour, _TZ).date()
+    _, day_end = day_bounds(day, day)
+    return day + timedelta(days=1) if last_hour + HOUR_SECONDS >= day_end else day
+
+
+def missing_range(
+    last_hours: dict[str, float | None], yesterday: date
+) -> tuple[date, date] | None:
+    """Return the days to import so every statistic reaches ``yesterday``.
+
+    Statistics never imported are left to the import services, and the gap is
+    capped at ``CATCH_UP_MAX_DAYS`` so a long outage does not turn into an
+    unbounded backfill.
+    """
+    first_days = [
+        _first_missing_day(last_hour)
+        for last_hour in last_hours.values()
+        if last_hour is not None
+    ]
+    if not first_days:
+        return None
+    start = max(min(first_days), yesterday - timedelta(days=CATCH_UP_MAX_DAYS - 1))
+    if start > yesterday:
+        return None
+    return start, yesterday
@@ -23,29 +23,39 @@ from homeassistant.helpers import selector
 
 from .const import (
     CONF_CONSUMED,
+    CONF_DISTRIBUTION_FEE,
     CONF_EXPORT_BALANCE,
+    CONF_FETCH_CONCURRENCY,
     CONF_FIXED_PRICE,
     CONF_IMAP,
     CONF_IMAP_FOLDER,
     CONF_IMAP_HOST,
     CONF_IMAP_PORT,
     CONF_IMAP_SENDER,
+    CONF_KEEPALIVE_MINUTES,
+    CONF_NIGHT_DISTRIBUTION_FEE,
+    CONF_NIGHT_PRICE,
     CONF_OBJECTS,
     CONF_PRICE_CURRENCY,
     CONF_PRICE_ENTITY,
     CONF_PROVIDER,
     CONF_RETURNED,
+    CONF_SUB_HOURLY,
+    DEFAULT_FETCH_CONCURRENCY,
     DEFAULT_IMAP_FOLDER,
     DEFAULT_IMAP_HOST,
     DEFAULT_IMAP_PORT,
     DEFAULT_IMAP_SENDER,
+    DEFAULT_KEEPALIVE_MINUTES,
     DEFAULT_PRICE_CURRENCY,
     DEFAULT_PROVIDER,
+    DEFAULT_SUB_HOURLY,
     DOMAIN,
+    MAX_FETCH_CONCURRENCY,
+    MAX_KEEPALIVE_MINUTES,
     PROVIDER_ESO,
     PROVIDER_IGNITIS,
     PROVIDERS,
-    SESSION_FILE,
     SUBENTRY_TYPE_OBJECT,
 )
 from .eso_client import (
@@ -55,6 +65,7 @@ from .eso_client import (
     ESOError,
 )
 from .ignitis_client import IgnitisClient
+from .session_store import SessionStore, records_from_cookies
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -143,7 +154,6 @@ def _make_client(
         username=username,
         password=password,
         imap_config=_runtime_imap(imap),
-        session_file=hass.config.path(SESSION_FILE),
     )
 
 
@@ -182,6 +192,24 @@ def _settings_schema(defaults: dict) -> vol.Schema:
             ): selector.NumberSelector(
                 selector.NumberSelectorConfig(mode="box", step="any")
             ),
+            vol.Optional(
+                CONF_NIGHT_PRICE,
+                description={"suggested_value": defaults.get(CONF_NIGHT_PRICE)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(mode="box", step="any")
+            ),
+            vol.Optional(
+                CONF_DISTRIBUTION_FEE,
+                description={"suggested_value": defaults.get(CONF_DISTRIBUTION_FEE)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(mode="box", step="any")
+            ),
+            vol.Optional(
+                CONF_NIGHT_DISTRIBUTION_FEE,
+                description={"suggested_value": defaults.get(CONF_NIGHT_DISTRIBUTION_FEE)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(mode="box", step="any")
+            ),
             vol.Required(
                 CONF_EXPORT_BALANCE, default=defaults.get(CONF_EXPORT_BALANCE, False)
             ): bool,
@@ -202,9 +230,14 @@ def _object_from_settings(obj_id: str, name: str, user_input: dict) -> dict:
     price_entity = user_input.get(CONF_PRICE_ENTITY)
     if price_entity:
         obj[CONF_PRICE_ENTITY] = price_entity
-    fixed_price = user_input.get(CONF_FIXED_PRICE)
-    if fixed_price is not None:
-        obj[CONF_FIXED_PRICE] = fixed_price
+    for key in (
+        CONF_FIXED_PRICE,
+        CONF_NIGHT_PRICE,
+        CONF_DISTRIBUTION_FEE,
+        CONF_NIGHT_DISTRIBUTION_FEE,
+    ):
+        if user_input.get(key) is not None:
+            obj[key] = user_input[key]
     return obj
 
 
@@ -222,6 +255,7 @@ class ESOConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for ESO Energy Consumption."""
 
     VERSION = 1
+    MINOR_VERSION = 2
 
     def __init__(self) -> None:
         self._provider: str = DEFAULT_PROVIDER
@@ -229,6 +263,8 @@ class ESOConfigFlow(ConfigFlow, domain=DOMAIN):
         self._password: str | None = None
         self._imap: dict | None = None
         self._discovered: list[dict] = []
+        # Cookies of the discovery login, stored once the entry is created
+        self._session_records: list[dict] | None = None
         self._reauth_entry: ConfigEntry | None = None
 
     # ---- step 1: provider + credentials -----------------------------------
@@ -331,6 +367,10 @@ class ESOConfigFlow(ConfigFlow, domain=DOMAIN):
                 )
             if not self._discovered:
                 return self.async_abort(reason="no_objects")
+            if isinstance(client, ESOClient) and client.session_alive:
+                # Hand the discovery login over to the new entry so its first
+                # import does not need another email code.
+                self._session_records = records_from_cookies(client.session.cookies)
 
         choices = {obj[CONF_ID]: obj[CONF_NAME] for obj in self._discovered}
 
@@ -359,9 +399,14 @@ class ESOConfigFlow(ConfigFlow, domain=DOMAIN):
                 }
                 if self._provider == PROVIDER_ESO:
                     data[CONF_IMAP] = self._imap
-                return self.async_create_entry(
+                result = self.async_create_entry(
                     title=self._username, data=data, subentries=subentries
                 )
+                if self._session_records:
+                    await SessionStore(self.hass, self.unique_id).async_save(
+                        self._session_records
+                    )
+                return result
 
         schema = vol.Schema(
             {
@@ -412,8 +457,14 @@ class ESOConfigFlow(ConfigFlow, domain=DOMAIN):
             }
             if obj.get(CONF_PRICE_ENTITY):
                 entry[CONF_PRICE_ENTITY] = obj[CONF_PRICE_ENTITY]
-            if obj.get(CONF_FIXED_PRICE) is not None:
-                entry[CONF_FIXED_PRICE] = obj[CONF_FIXED_PRICE]
+            for key in (
+                CONF_FIXED_PRICE,
+                CONF_NIGHT_PRICE,
+                CONF_DISTRIBUTION_FEE,
+                CONF_NIGHT_DISTRIBUTION_FEE,
+            ):
+                if obj.get(key) is not None:
+                    entry[key] = obj[key]
             subentries.append(_object_subentry(entry))
 
         return self.async_create_entry(
@@ -543,13 +594,46 @@ class ESOOptionsFlow(OptionsFlow):
                 self.hass.config_entries.async_update_entry(
                     self.config_entry, data=new_data
                 )
-                return self.async_create_entry(data={})
+                options = {
+                    CONF_FETCH_CONCURRENCY: user_input[CONF_FETCH_CONCURRENCY],
+                    CONF_SUB_HOURLY: user_input[CONF_SUB_HOURLY],
+                }
+                if is_eso:
+                    options[CONF_KEEPALIVE_MINUTES] = user_input[CONF_KEEPALIVE_MINUTES]
+                return self.async_create_entry(data=options)
 
         schema = vol.Schema(
-            {vol.Required(CONF_PASSWORD, default=data.get(CONF_PASSWORD)): str}
+            {
+                vol.Required(CONF_PASSWORD, default=data.get(CONF_PASSWORD)): str,
+                vol.Required(
+                    CONF_FETCH_CONCURRENCY,
+                    default=self.config_entry.options.get(
+                        CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY
+                    ),
+                ): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_FETCH_CONCURRENCY)
+                ),
+                vol.Required(
+                    CONF_SUB_HOURLY,
+                    default=self.config_entry.options.get(
+                        CONF_SUB_HOURLY, DEFAULT_SUB_HOURLY
+                    ),
+                ): bool,
+            }
         )
         if is_eso:
             schema = schema.extend(
+                {
+                    vol.Required(
+                        CONF_KEEPALIVE_MINUTES,
+                        default=self.config_entry.options.get(
+                            CONF_KEEPALIVE_MINUTES, DEFAULT_KEEPALIVE_MINUTES
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_KEEPALIVE_MINUTES)
+                    ),
+                }
+            ).extend(
                 _imap_schema(
                     {
                         CONF_IMAP_USERNAME: imap.get(CONF_USERNAME, ""),
@@ -13,6 +13,9 @@ CONF_COST = "cost"
 CONF_PRICE_ENTITY = "price_entity"
 CONF_PRICE_CURRENCY = "price_currency"
 CONF_FIXED_PRICE = "fixed_price"
+CONF_NIGHT_PRICE = "night_price"
+CONF_DISTRIBUTION_FEE = "distribution_fee"
+CONF_NIGHT_DISTRIBUTION_FEE = "night_distribution_fee"
 CONF_EXPORT_BALANCE = "export_balance"
 
 # Data provider selection
@@ -37,8 +40,36 @@ DEFAULT_IMAP_SENDER = "savitarna@eso.lt"
 DEFAULT_IMAP_FOLDER = "INBOX"
 DEFAULT_PRICE_CURRENCY = "EUR"
 
-# Persisted authenticated session (see ESOClient)
-SESSION_FILE = "eso_session.json"
+# Persisted authenticated ESO session (see SessionStore), one store per account
+SESSION_STORAGE_KEY = f"{DOMAIN}.session"
+SESSION_STORAGE_VERSION = 1
+# Session file shared by all accounts before SessionStore, removed on migration
+LEGACY_SESSION_FILE = "eso_session.json"
+
+# Recorder look-back windows (days) used to find the last cumulative sum before
+# an import. The short window covers the usual daily run; the long one survives
+# multi-day fetch failures.
+PREVIOUS_SUM_LOOKBACK_DAYS = (1, 60)
+
+# Persisted cumulative-sum anchors (see AnchorStore), one store per config entry
+ANCHOR_STORAGE_KEY = f"{DOMAIN}.anchors"
+ANCHOR_STORAGE_VERSION = 1
+ANCHOR_SAVE_DELAY_SECONDS = 10
+# Trailing hours whose values are remembered per series, so re-fetched hours
+# (ESO returns a whole week every day) are only rewritten when they change.
+ANCHOR_WINDOW_HOURS = 9 * 24
+
+# Chunk size (days) used when re-chaining the sums of rows after a past write
+RECHAIN_CHUNK_DAYS = 30
+
+# Local days whose DST-aware hour grid is kept cached (see hour_grid)
+HOUR_GRID_CACHE_DAYS = 1024
+
+# Two-zone tariff (see tariff): zones follow standard time (UTC+2) all year, the
+# night zone covers workday hours from 23:00 to 07:00 and whole weekends
+TARIFF_STANDARD_UTC_OFFSET_HOURS = 2
+TARIFF_NIGHT_START_HOUR = 23
+TARIFF_NIGHT_END_HOUR = 7
 
 # ESO energy series keys
 POWER_CONSUMED = "P+"
@@ -67,6 +98,23 @@ IGNITIS_IMPORT_MINUTE = 30
 IGNITIS_RETRY_DELAY_SECONDS = 10 * 60
 IGNITIS_MAX_RETRIES = 10
 
+# Objects of one account fetched concurrently during an import (account option)
+CONF_FETCH_CONCURRENCY = "fetch_concurrency"
+DEFAULT_FETCH_CONCURRENCY = 4
+MAX_FETCH_CONCURRENCY = 16
+
+# ESO session keep-alive interval (account option, minutes; 0 disables it). Must
+# stay below Drupal's autologout window for the session to survive to the next
+# daily import.
+CONF_KEEPALIVE_MINUTES = "keepalive_minutes"
+DEFAULT_KEEPALIVE_MINUTES = 0
+MAX_KEEPALIVE_MINUTES = 24 * 60
+
+# Fetch 15-minute data and roll it up into the hourly statistics (account
+# option, experimental until the provider parameters are confirmed)
+CONF_SUB_HOURLY = "sub_hourly"
+DEFAULT_SUB_HOURLY = False
+
 # Subentry type: one metering point (object) per subentry
 SUBENTRY_TYPE_OBJECT = "object"
 
@@ -76,3 +124,17 @@ ATTR_CONFIG_ENTRY_ID = "config_entry_id"
 # Optional reference date for the import (defaults to now); use it to backfill a
 # past day. Providers import relative to this date exactly as the daily run does.
 ATTR_DATE = "date"
+
+# Service to backfill a date range with as few provider requests as possible
+SERVICE_IMPORT_RANGE = "import_range"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+
+# Import runs whose timings are kept for diagnostics and the diagnostic sensors
+IMPORT_METRICS_HISTORY = 10
+# Dispatcher signal sent when an import run of a config entry finished
+SIGNAL_IMPORT_FINISHED = f"{DOMAIN}_import_finished_{{}}"
+
+# Most days imported automatically to close a gap left by downtime or failed
+# daily imports; longer gaps need the import_range service
+CATCH_UP_MAX_DAYS = 31
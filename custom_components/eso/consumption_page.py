@@ -0,0 +1,100 @@
+"""Single-pass scan of the ESO consumption page.
+
+After login the page is needed for two things: the Drupal form tokens of the
+consumption form (``form_build_id``, ``form_token``, ``form_id``) and the
+``<select name="objects[]">`` options listing the account's objects. Instead of
+running an ``HTMLParser`` over the whole document once per purpose, the
+consumption form element is located by its Drupal id
+(``eso-consumption-history-form``) and only the tags between its ``<form>`` and
+``</form>`` are scanned; the rest of the page (header, scripts, footer) is
+never tokenized.
+
+When the page does not carry the consumption form (a login page, an expired
+session) the result is empty. When the form is there but cannot be delimited,
+or its range lacks the tokens or the objects select (e.g. a select rendered
+after ``</form>``), the whole page is handed to ``FormParser`` and
+``SelectObjectsParser``.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass, field
+
+from .form_parser import FormParser
+from .objects_parser import SelectObjectsParser
+
+CONSUMPTION_FORM_ID = "eso_consumption_history_form"
+FORM_FIELDS = ("form_build_id", "form_token", "form_id")
+
+_FORM_START = re.compile(r"<form\b[^>]*eso-consumption-history-form", re.IGNORECASE)
+_TAG = re.compile(r"<(/?)(input|select|option)\b([^>]*)>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"""([^\s=/>]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+
+
+@dataclass
+class ConsumptionPage:
+    """Form tokens and ``id -> label`` objects of a consumption page."""
+
+    form: dict[str, str] = field(default_factory=dict)
+    objects: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_consumption(self) -> bool:
+        return self.form.get("form_id") == CONSUMPTION_FORM_ID
+
+
+def _attributes(text: str) -> dict[str, str]:
+    return {
+        match.group(1).lower(): html.unescape(
+            next(value for value in match.groups()[1:] if value is not None)
+        )
+        for match in _ATTRIBUTE.finditer(text)
+    }
+
+
+def scan_consumption_page(page: str) -> ConsumptionPage:
+    """Return the consumption form tokens and objects found in ``page``."""
+    if CONSUMPTION_FORM_ID not in page:
+        return ConsumptionPage()
+    form_start = _FORM_START.search(page)
+    end = page.find("</form>", form_start.end()) if form_start else -1
+    if end < 0:
+        return _parse_whole_page(page)
+    result = ConsumptionPage()
+    in_select = False
+    option: str | None = None
+    option_text_start = 0
+    for match in _TAG.finditer(page, form_start.start(), end):
+        closing, tag = match.group(1), match.group(2).lower()
+        if tag == "input" and not closing:
+            attributes = _attributes(match.group(3))
+            if attributes.get("name") in FORM_FIELDS:
+                result.form[attributes["name"]] = attributes.get("value", "")
+        elif tag == "select" or (tag == "option" and in_select):
+            if option is not None:
+                _add_option(result, option, page[option_text_start:match.start()])
+                option = None
+            if tag == "select":
+                in_select = not closing and _attributes(match.group(3)).get("name") == "objects[]"
+            elif not closing:
+                option = _attributes(match.group(3)).get("value")
+                option_text_start = match.end()
+    if not result.is_consumption or not result.objects:
+        return _parse_whole_page(page)
+    return result
+
+
+def _add_option(result: ConsumptionPage, value: str, text: str) -> None:
+    label = " ".join(html.unescape(re.sub(r"<[^>]+>", "", text)).split())
+    if value.isdigit() and label:
+        result.objects[value] = label
+
+
+def _parse_whole_page(page: str) -> ConsumptionPage:
+    form_parser = FormParser()
+    form_parser.feed(page)
+    select_parser = SelectObjectsParser()
+    select_parser.feed(page)
+    return ConsumptionPage(dict(form_parser.form), dict(select_parser.objects))
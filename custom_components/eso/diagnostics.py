@@ -0,0 +1,29 @@
+"""Diagnostics support for the ESO Energy Consumption integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import ESOConfigEntry, _entry_objects
+from .const import CONF_PROVIDER, DEFAULT_PROVIDER
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ESOConfigEntry
+) -> dict[str, Any]:
+    """Return the account settings and the timings of its recent imports."""
+    runtime = entry.runtime_data
+    return {
+        "provider": entry.data.get(CONF_PROVIDER, DEFAULT_PROVIDER),
+        "data": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": dict(entry.options),
+        "objects": len(_entry_objects(entry)),
+        "session_alive": getattr(runtime.client, "session_alive", None),
+        "import_runs": [run.as_dict() for run in runtime.import_runs],
+    }
@@ -1,23 +1,57 @@
 import logging
 import re
-import json
+import asyncio
+import threading
 import time
 import imaplib
 import email
 from email.header import decode_header
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from datetime import date, datetime, timedelta
+import aiohttp
 import requests
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from yarl import URL
+from .ajax_parser import extract_commands
 from .form_parser import FormParser
-from .objects_parser import (
-    SelectObjectsParser,
-    clean_object_name,
+from .hour_grid import day_bounds
+from .hourly_series import HourlySeries, QuarterHourSeries
+from .import_metrics import (
+    COUNTER_BYTES_RECEIVED,
+    COUNTER_REQUESTS,
+    PHASE_FETCH,
+    PHASE_OTP_WAIT,
+    PHASE_PARSE,
+    count,
+    phase,
 )
+from .otp_listener import OtpListener, imap_connect
+from .record_parser import (
+    ESO_QUARTER_STAMP,
+    ESO_STAMP,
+    ParseReport,
+    record_epochs,
+    rollup_quarters,
+    series_from_points,
+)
+from .session_store import SessionStore, records_from_morsels
+from .consumption_page import CONSUMPTION_FORM_ID, ConsumptionPage, scan_consumption_page
+from .objects_parser import clean_object_name
 
-LOGIN_URL = "https://mano.eso.lt/?destination=/consumption"
-GENERATION_URL = "https://mano.eso.lt/consumption?ajax_form=1&_wrapper_format=drupal_ajax"
+BASE_URL = "https://mano.eso.lt"
+LOGIN_PATH = "/?destination=/consumption"
+GENERATION_PATH = "/consumption?ajax_form=1&_wrapper_format=drupal_ajax"
 TFA_FORM_ID = "gpc_tfa_login_auth_form"
-CONSUMPTION_FORM_ID = "eso_consumption_history_form"
+# Consumption form resolutions. The 15-minute value is what the form is
+# expected to take for meters read at that interval; it has not been confirmed
+# against the live service.
+DISPLAY_TYPE_HOURLY = "hourly"
+DISPLAY_TYPE_QUARTER = "15min"
+FETCH_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "X-Requested-With": "XMLHttpRequest",
+}
 
 class ESOError(Exception):
     """Base error for ESO client failures."""
@@ -42,21 +76,70 @@ USER_AGENT = (
 # ESO the moment the password POST lands on the TFA page).
 OTP_POLL_TIMEOUT = 120
 OTP_POLL_INTERVAL = 5
+# Leading bytes of a candidate email's body fetched to find the code in; the
+# whole message is only downloaded when the code is not within them.
+OTP_BODY_PEEK_BYTES = 16384
+OTP_HEADER_FIELDS = "DATE FROM CONTENT-TYPE CONTENT-TRANSFER-ENCODING MIME-VERSION"
 MONTHS = [
     "Sausio", "Vasario", "Kovo", "Balandžio", "Gegužės", "Birželio", "Liepos", "Rugpjūčio", "Rugsėjo", "Spalio", "Lapkričio", "Gruodžio"
 ]
 _LOGGER = logging.getLogger(__name__)
 
 
+def plan_week_requests(start: date, end: date) -> list[date]:
+    """Return the ``active_date`` values of the week requests covering a range.
+
+    ESO serves hourly data one week per request, but how that week is aligned
+    to ``active_date`` is not documented. Stepping back from ``end`` in
+    seven-day strides tiles the range with windows ending on each date and hits
+    every calendar week exactly once; a final request on ``start`` (unless a
+    stride already landed on it) covers a window beginning there.
+    """
+    dates: list[date] = []
+    active = end
+    while active >= start:
+        dates.append(active)
+        active -= timedelta(days=7)
+    if dates and dates[-1] != start:
+        dates.append(start)
+    return dates
+
+
+def _log_fetch_response(text: str, commands: list) -> None:
+    """Log the size and commands of a consumption response, not its body."""
+    _LOGGER.debug(
+        "Got fetch response: %d characters, commands %s",
+        len(text),
+        [command.get("command") for command in commands],
+    )
+
+
 class ESOClient:
-    def __init__(self, username: str, password: str, imap_config: dict | None = None, session_file: str | None = None):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        imap_config: dict | None = None,
+        base_url: str = BASE_URL,
+        sub_hourly: bool = False,
+    ):
         self.username: str = username
         self.password: str = password
         self.imap_config: dict | None = imap_config
-        self.session_file: str | None = session_file
+        # Fetch 15-minute data and roll it up into the hourly series
+        self.sub_hourly: bool = sub_hourly
+        # Overridable for a local stand-in of ESO (see benchmarks/fake_services)
+        self.login_url: str = base_url + LOGIN_PATH
+        self.generation_url: str = base_url + GENERATION_PATH
         self.session: requests.Session = self._new_session()
         self.cookies: dict | None = None
+        # Whether the last consumption page load found the session authenticated
+        self.session_alive: bool = False
         self.form_parser: FormParser = FormParser()
+        # Tokens and objects of the last consumption page load
+        self.consumption_page: ConsumptionPage = ConsumptionPage()
+        # Serialises consumption form posts, see _fetch_week
+        self._form_lock = threading.Lock()
         self.dataset: dict = {}
 
     @staticmethod
@@ -68,8 +151,8 @@ class ESOClient:
     def login(self) -> None:
         """Establish an authenticated ESO session.
 
-        Strategy: try to reuse a persisted Drupal session cookie, falling back
-        to a full password -> email-OTP login when it is gone. NOTE: ESO runs
+        Strategy: reuse the current Drupal session while it is alive, falling
+        back to a full password -> email-OTP login when it is gone. NOTE: ESO runs
         Drupal's autologout module (see the Drupal.visitor.autologout_login
         cookie), which terminates idle sessions after a short inactivity
         window. A stored session was observed dead only a few hours later, so a
@@ -81,15 +164,14 @@ class ESOClient:
         """
         self.dataset = {}
         try:
-            if self._load_session() and self._open_consumption():
-                _LOGGER.info("ESO: reused stored session, skipping 2FA login")
+            if self.session_alive and self._open_consumption():
+                _LOGGER.info("ESO: reused live session, skipping 2FA login")
                 return
-            _LOGGER.info("ESO: no valid stored session, performing full login")
+            _LOGGER.info("ESO: no live session, performing full login")
             self.session = self._new_session()
             self._full_login()
             if self._open_consumption():
-                self._save_session()
-                _LOGGER.info("ESO: full login successful, session saved")
+                _LOGGER.info("ESO: full login successful")
             else:
                 _LOGGER.error("ESO login did not reach the consumption page")
         except requests.exceptions.RequestException as e:
@@ -111,13 +193,8 @@ class ESOClient:
         session = self._new_session()
         try:
             response = session.post(
-                LOGIN_URL,
-                data={
-                    "name": self.username,
-                    "pass": self.password,
-                    "login_type": 1,
-                    "form_id": "user_login_form",
-                },
+                self.login_url,
+                data=self._login_payload(),
                 allow_redirects=True,
             )
             response.raise_for_status()
@@ -125,16 +202,14 @@ class ESOClient:
             raise ESOConnectionError(str(e)) from e
         if "/user/login/tfa/" in response.url:
             return True
-        parser = FormParser()
-        parser.feed(response.text)
-        return parser.get("form_id") == CONSUMPTION_FORM_ID
+        return scan_consumption_page(response.text).is_consumption
 
     def discover_objects(self) -> list[dict]:
         """Return the account's objects as ``[{"id", "name"}]``.
 
-        Performs a full login and scrapes the object IDs from the
-        consumption-page selector. The display name is the option label with
-        the trailing meter number stripped off.
+        Performs a full login and takes the object IDs from the selector of
+        the consumption page the login ended on. The display name is the
+        option label with the trailing meter number stripped off.
 
         Raises:
             ESOConnectionError: ESO could not be reached.
@@ -144,16 +219,8 @@ class ESOClient:
         self.login()
         if self.form_parser.get("form_id") != CONSUMPTION_FORM_ID:
             raise ESOAuthError("Login did not reach the consumption page")
-        try:
-            response = self.session.get(LOGIN_URL, allow_redirects=True)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise ESOConnectionError(str(e)) from e
-        select_parser = SelectObjectsParser()
-        select_parser.feed(response.text)
-
         objects: list[dict] = []
-        for obj_id, label in select_parser.objects.items():
+        for obj_id, label in self.consumption_page.objects.items():
             objects.append({"id": obj_id, "name": clean_object_name(label)})
         return objects
 
@@ -162,23 +229,51 @@ class ESOClient:
         Drupal form tokens. Returns True when the session is authenticated
         (i.e. the consumption form is present rather than the login form)."""
         self.form_parser = FormParser()
-        response = self.session.get(LOGIN_URL, allow_redirects=True)
+        response = self.session.get(self.login_url, allow_redirects=True)
         response.raise_for_status()
         self.cookies = requests.utils.dict_from_cookiejar(self.session.cookies)
-        self.form_parser.feed(response.text)
-        return self.form_parser.get("form_id") == CONSUMPTION_FORM_ID
+        return self._read_consumption_page(response.text)
+
+    def _read_consumption_page(self, html: str) -> bool:
+        """Keep the form tokens and objects of a consumption page load and
+        return whether it shows the authenticated consumption form."""
+        self.consumption_page = scan_consumption_page(html)
+        for name, value in self.consumption_page.form.items():
+            self.form_parser.set(name, value)
+        self.session_alive = self.consumption_page.is_consumption
+        return self.session_alive
+
+    def _login_payload(self) -> dict:
+        return {
+            "name": self.username,
+            "pass": self.password,
+            "login_type": 1,
+            "form_id": "user_login_form",
+        }
+
+    @staticmethod
+    def _tfa_payload(code: str, build_id: str) -> dict:
+        return {
+            "code": code,
+            "submit_code": "Submit code",
+            "form_build_id": build_id,
+            "form_id": TFA_FORM_ID,
+        }
 
     def _full_login(self) -> None:
         """Submit the username/password form. ESO redirects to the TFA page
         and emails a one-time code, which we then retrieve and submit."""
+        listener = self._open_otp_listener()
+        try:
+            self._submit_login(listener)
+        finally:
+            if listener is not None:
+                listener.close()
+
+    def _submit_login(self, listener: OtpListener | None) -> None:
         response = self.session.post(
-            LOGIN_URL,
-            data={
-                "name": self.username,
-                "pass": self.password,
-                "login_type": 1,
-                "form_id": "user_login_form",
-            },
+            self.login_url,
+            data=self._login_payload(),
             allow_redirects=True,
         )
         response.raise_for_status()
@@ -193,19 +288,14 @@ class ESOClient:
         if not build_id:
             _LOGGER.error("ESO: could not find TFA form_build_id on %s", tfa_url)
             return
-        code = self._fetch_otp(login_started)
+        code = self._fetch_otp(login_started, listener)
         if not code:
             _LOGGER.error("ESO: did not receive a 2FA code via IMAP in time")
             return
         _LOGGER.info("ESO: submitting 2FA code")
         submit = self.session.post(
             tfa_url,
-            data={
-                "code": code,
-                "submit_code": "Submit code",
-                "form_build_id": build_id,
-                "form_id": TFA_FORM_ID,
-            },
+            data=self._tfa_payload(code, build_id),
             allow_redirects=True,
         )
         submit.raise_for_status()
@@ -227,7 +317,22 @@ class ESOClient:
 
     # ---- IMAP one-time-code retrieval -------------------------------------
 
-    def _fetch_otp(self, login_started: datetime) -> str | None:
+    def _open_otp_listener(self) -> OtpListener | None:
+        """Open the mailbox ahead of the password POST so the code email can
+        be picked up as soon as it arrives. Returns None (and the code is
+        polled for instead) when no mailbox is configured or it cannot be
+        opened."""
+        if not self.imap_config:
+            return None
+        listener = OtpListener(self.imap_config, OTP_POLL_INTERVAL)
+        try:
+            listener.open()
+        except Exception as e:  # noqa: BLE001
+            _LOGGER.warning("ESO: could not open mailbox ahead of login: %s", e)
+            return None
+        return listener
+
+    def _fetch_otp(self, login_started: datetime, listener: OtpListener | None = None) -> str | None:
         if not self.imap_config:
             _LOGGER.error("ESO: 2FA required but no IMAP config provided")
             return None
@@ -236,6 +341,14 @@ class ESOClient:
         # Only accept messages that arrived after we triggered the login,
         # with a small clock-skew allowance, so we never reuse a stale code.
         min_time = login_started - timedelta(minutes=2)
+        if listener is not None:
+            try:
+                return listener.wait(
+                    lambda conn: self._search_code(conn, cfg, min_time, listener.uid_next),
+                    OTP_POLL_TIMEOUT,
+                )
+            except Exception as e:  # noqa: BLE001
+                _LOGGER.warning("ESO: mailbox listener failed, polling instead: %s", e)
         while time.monotonic() < deadline:
             try:
                 code = self._poll_imap_once(cfg, min_time)
@@ -247,40 +360,87 @@ class ESOClient:
         return None
 
     def _poll_imap_once(self, cfg: dict, min_time: datetime) -> str | None:
-        conn = imaplib.IMAP4_SSL(cfg["host"], cfg.get("port", 993))
+        conn = imap_connect(cfg)
         try:
             conn.login(cfg["username"], cfg["password"])
             conn.select(cfg.get("folder", "INBOX"))
-            since = min_time.strftime("%d-%b-%Y")
-            typ, data = conn.search(None, f'(FROM "{cfg["sender"]}" SINCE {since})')
-            if typ != "OK" or not data or not data[0]:
-                return None
-            ids = data[0].split()
-            # Newest first.
-            for msg_id in reversed(ids):
-                typ, msg_data = conn.fetch(msg_id, "(RFC822)")
-                if typ != "OK" or not msg_data or not msg_data[0]:
-                    continue
-                msg = email.message_from_bytes(msg_data[0][1])
-                msg_dt = self._parse_msg_date(msg)
-                if msg_dt and msg_dt < min_time:
-                    continue
-                code = self._extract_code(self._message_text(msg))
-                if code:
-                    # The code is single-use; remove the email so it doesn't
-                    # pile up in the inbox (ESO sends one on every login, and
-                    # its autologout forces a fresh login on each daily run).
-                    self._delete_message(conn, msg_id)
-                    return code
-            return None
+            return self._search_code(conn, cfg, min_time)
         finally:
             try:
                 conn.logout()
             except Exception:  # noqa: BLE001
                 pass
 
+    def _search_code(
+        self,
+        conn: imaplib.IMAP4,
+        cfg: dict,
+        min_time: datetime,
+        min_uid: int | None = None,
+    ) -> str | None:
+        """Return the code of the newest matching email in the selected folder.
+
+        With ``min_uid`` (the folder's UIDNEXT before the login) only messages
+        delivered since are searched; otherwise the search is by date. Each
+        candidate is read from its headers and the first OTP_BODY_PEEK_BYTES
+        of its body.
+        """
+        if min_uid is not None:
+            criteria = f'UID {min_uid}:* FROM "{cfg["sender"]}"'
+        else:
+            criteria = f'FROM "{cfg["sender"]}" SINCE {min_time.strftime("%d-%b-%Y")}'
+        typ, data = conn.uid("SEARCH", None, criteria)
+        if typ != "OK" or not data or not data[0]:
+            return None
+        # "n:*" always matches the newest message, even below n.
+        uids = [uid for uid in data[0].split() if min_uid is None or int(uid) >= min_uid]
+        # Newest first.
+        for uid in sorted(uids, key=int, reverse=True):
+            msg, truncated = self._peek_message(conn, uid)
+            if msg is None:
+                continue
+            msg_dt = self._parse_msg_date(msg)
+            if msg_dt and msg_dt < min_time:
+                continue
+            code = self._extract_code(self._message_text(msg))
+            if not code and truncated:
+                typ, msg_data = conn.uid("FETCH", uid, "(RFC822)")
+                if typ == "OK" and msg_data and isinstance(msg_data[0], tuple):
+                    code = self._extract_code(self._message_text(email.message_from_bytes(msg_data[0][1])))
+            if code:
+                # The code is single-use; remove the email so it doesn't
+                # pile up in the inbox (ESO sends one on every login, and
+                # its autologout forces a fresh login on each daily run).
+                self._delete_message(conn, uid)
+                return code
+        return None
+
     @staticmethod
-    def _delete_message(conn, msg_id) -> None:
+    def _peek_message(conn: imaplib.IMAP4, uid: bytes) -> tuple[email.message.Message | None, bool]:
+        """Fetch the headers needed to decode a message plus the start of its
+        body. Returns the (possibly truncated) message and whether the body
+        was cut off."""
+        typ, msg_data = conn.uid(
+            "FETCH",
+            uid,
+            f"(BODY.PEEK[HEADER.FIELDS ({OTP_HEADER_FIELDS})] BODY.PEEK[TEXT]<0.{OTP_BODY_PEEK_BYTES}>)",
+        )
+        if typ != "OK" or not msg_data:
+            return None, False
+        header = text = None
+        for part in msg_data:
+            if not isinstance(part, tuple):
+                continue
+            if b"HEADER" in part[0].upper():
+                header = part[1]
+            elif b"TEXT" in part[0].upper():
+                text = part[1]
+        if header is None or text is None:
+            return None, False
+        return email.message_from_bytes(header + text), len(text) >= OTP_BODY_PEEK_BYTES
+
+    @staticmethod
+    def _delete_message(conn, uid) -> None:
         """Delete the consumed OTP email and expunge it from the folder.
 
         Standard IMAP delete (\\Deleted + EXPUNGE). On Gmail this removes the
@@ -288,7 +448,7 @@ class ESOClient:
         servers remove it outright. Best-effort: a failure here must never
         block a successful login."""
         try:
-            conn.store(msg_id, "+FLAGS", "\\Deleted")
+            conn.uid("STORE", uid, "+FLAGS", "\\Deleted")
             conn.expunge()
         except Exception as e:  # noqa: BLE001
             _LOGGER.warning("ESO: could not delete consumed OTP email: %s", e)
@@ -338,51 +498,19 @@ class ESOClient:
         m = re.search(r"(?<!\d)(\d{6})(?!\d)", plain)
         return m.group(1) if m else None
 
-    # ---- session persistence ----------------------------------------------
-
-    def _save_session(self) -> None:
-        if not self.session_file:
-            return
-        try:
-            jar = requests.utils.dict_from_cookiejar(self.session.cookies)
-            with open(self.session_file, "w") as fh:
-                json.dump(jar, fh)
-        except Exception as e:  # noqa: BLE001
-            _LOGGER.warning("ESO: could not save session: %s", e)
-
-    def _load_session(self) -> bool:
-        if not self.session_file:
-            return False
-        try:
-            with open(self.session_file) as fh:
-                jar = json.load(fh)
-        except FileNotFoundError:
-            return False
-        except Exception as e:  # noqa: BLE001
-            _LOGGER.warning("ESO: could not load session: %s", e)
-            return False
-        if not jar:
-            return False
-        self.session = self._new_session()
-        self.session.cookies = requests.utils.cookiejar_from_dict(jar)
-        return True
-
-    def fetch(self, obj: str, date: datetime) -> dict:
+    def _fetch_payload(self, obj: str, date: date) -> dict | None:
+        """Return the consumption form post for ``obj``'s week at ``date``, or
+        None when the session has no usable consumption form."""
         if not self.cookies:
             _LOGGER.error("Cookies are empty. Check your credentials.")
-            return {}
+            return None
         if self.form_parser.get("form_id") != CONSUMPTION_FORM_ID:
             _LOGGER.error("Form ID not found. Check your credentials OR login to ESO and confirm contact information.")
-            return {}
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "X-Requested-With": "XMLHttpRequest",
-        }
-        data = {
+            return None
+        return {
             "objects[]": obj,
             "objects_mock": "",
-            "display_type": "hourly",
+            "display_type": DISPLAY_TYPE_QUARTER if self.sub_hourly else DISPLAY_TYPE_HOURLY,
             "period": "week",
             "energy_type": "general",
             "scales": "total",
@@ -396,41 +524,86 @@ class ESOClient:
             "_drupal_ajax": "1",
             "_triggering_element_name": "display_type",
         }
+
+    def fetch(self, obj: str, date: date) -> list:
+        """Return the ``settings`` and ``update_build_id`` commands of the
+        consumption response for ``obj``'s week at ``date``."""
+        data = self._fetch_payload(obj, date)
+        if data is None:
+            return []
         try:
             response = self.session.post(
-                GENERATION_URL,
+                self.generation_url,
                 data=data,
-                headers=headers,
+                headers=FETCH_HEADERS,
                 cookies=self.cookies,
                 allow_redirects=False
             )
             response.raise_for_status()
-            _LOGGER.debug(f"Got fetch response: {response.text}")
-            return response.json()
         except requests.exceptions.RequestException as e:
-            _LOGGER.error(f"ESO fetch error: {e}")
-            return {}
+            _LOGGER.error("ESO fetch error: %s", e)
+            return []
+        text = response.text
+        commands = extract_commands(text)
+        _log_fetch_response(text, commands)
+        return commands
 
     def fetch_dataset(self, obj: str, date: datetime) -> dict | None:
         if obj in self.dataset:
             return self.dataset[obj]
         self.dataset[obj] = {}
-        data = self.fetch(obj, date)
+        self.dataset[obj] = self._fetch_week(obj, date)
+        return self.dataset[obj]
+
+    def fetch_range_dataset(self, obj: str, start: date, end: date) -> dict:
+        """Return the dataset of ``obj`` for ``start``..``end`` (inclusive).
+
+        The range is covered with week requests (see plan_week_requests) on
+        the current session instead of one login and request per day.
+        """
+        weeks = [self._fetch_week(obj, active_date) for active_date in plan_week_requests(start, end)]
+        return self._merge_weeks(weeks, start, end)
+
+    @staticmethod
+    def _merge_weeks(weeks: list[dict], start: date, end: date) -> dict:
+        merged: dict[str, HourlySeries] = {}
+        for week in weeks:
+            for consumption_type, series in week.items():
+                merged.setdefault(consumption_type, type(series)()).update(series)
+        range_start, range_end = day_bounds(start, end)
+        return {
+            consumption_type: series.clip(range_start, range_end)
+            for consumption_type, series in merged.items()
+        }
+
+    def _fetch_week(self, obj: str, active_date: date) -> dict:
+        # Every response may rotate the form_build_id the next post must send,
+        # so concurrent fetches on this session post one at a time; parsing
+        # the response happens outside the lock.
+        with self._form_lock:
+            data = self.fetch(obj, active_date)
+            self._update_build_id(data)
+        return self._parse_week(data)
+
+    def _update_build_id(self, data: list) -> None:
         for d in data:
             if d.get("command") == "update_build_id":
                 self.form_parser.set("form_build_id", d["new"])
-                continue
+
+    def _parse_week(self, data: list) -> dict:
+        result: dict = {}
+        for d in data:
             if d.get("command") != "settings":
                 continue
             if "eso_consumption_history_form" not in d["settings"] or not d["settings"]["eso_consumption_history_form"]:
                 continue
             datasets = d["settings"]["eso_consumption_history_form"]["graphics_data"]["datasets"]
             for dataset in datasets:
-                consumption_type = dataset["key"]
-                if consumption_type not in self.dataset[obj]:
-                    self.dataset[obj][consumption_type] = {}
-                self.dataset[obj][consumption_type] = self.parse_dataset(dataset)
-        return self.dataset[obj]
+                series = self.parse_dataset(dataset, self.sub_hourly)
+                if isinstance(series, QuarterHourSeries):
+                    series = rollup_quarters(series, "ESO")
+                result[dataset["key"]] = series
+        return result
 
     def get_dataset(self, obj: str) -> dict | None:
         if obj not in self.dataset:
@@ -438,14 +611,224 @@ class ESOClient:
         return self.dataset[obj]
 
     @staticmethod
-    def parse_dataset(dataset: dict) -> dict:
-        result = {}
-        for record in dataset["record"]:
+    def parse_dataset(dataset: dict, sub_hourly: bool = False) -> HourlySeries:
+        """Parse one dataset's records; a QuarterHourSeries when ``sub_hourly``
+        and ESO really returned 15-minute rows."""
+        records = dataset["record"]
+        report = ParseReport("ESO")
+        points: list[tuple[float, float]] = []
+        stamp = ESO_QUARTER_STAMP if sub_hourly else ESO_STAMP
+        for record, ts in zip(records, record_epochs(records, "date", stamp, report)):
+            if ts is None:
+                continue
             try:
-                dt = datetime.strptime(record["date"], "%Y%m%d%H%M")
-                ts = dt.timestamp()
-                val = abs(float(record["value"])) if record["value"] is not None else 0.0
-                result[ts] = val
-            except Exception as e:
-                _LOGGER.error(f"Failed to parse dataset record {record}: {e}")
-        return result
+                value = record["value"]
+                points.append((ts, abs(float(value)) if value is not None else 0.0))
+            except (KeyError, TypeError, ValueError):
+                report.bad_record(record)
+        report.log()
+        return series_from_points(points, sub_hourly, "ESO")
+
+
+class AsyncESOClient(ESOClient):
+    """ESOClient running its HTTP requests on an aiohttp session.
+
+    The session is created through Home Assistant (pooled connections, closed
+    on shutdown) with a cookie jar of its own, since the Drupal session cookie
+    belongs to this account only. The authenticated session is persisted in
+    the account's SessionStore. The blocking IMAP code lookup still runs in
+    the executor.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        imap_config: dict | None = None,
+        session_store: SessionStore | None = None,
+        base_url: str = BASE_URL,
+        sub_hourly: bool = False,
+    ):
+        super().__init__(username, password, imap_config, base_url, sub_hourly)
+        self._hass = hass
+        self._session_store = session_store
+        self._http: aiohttp.ClientSession = async_create_clientsession(
+            hass, cookie_jar=aiohttp.CookieJar()
+        )
+        self._async_form_lock = asyncio.Lock()
+
+    async def async_login(self) -> None:
+        """Establish an authenticated ESO session (see ESOClient.login)."""
+        self.dataset = {}
+        async with self._async_form_lock:
+            await self._async_login()
+
+    async def _async_login(self) -> None:
+        try:
+            if self.session_alive and await self._async_open_consumption():
+                _LOGGER.info("ESO: session kept alive, skipping 2FA login")
+                return
+            if await self._async_load_session() and await self._async_open_consumption():
+                _LOGGER.info("ESO: reused stored session, skipping 2FA login")
+                return
+            _LOGGER.info("ESO: no valid stored session, performing full login")
+            self._http.cookie_jar.clear()
+            await self._async_full_login()
+            if await self._async_open_consumption():
+                await self._async_save_session()
+                _LOGGER.info("ESO: full login successful, session saved")
+            else:
+                _LOGGER.error("ESO login did not reach the consumption page")
+        except aiohttp.ClientError as e:
+            _LOGGER.error("ESO login error: %s", e)
+        except Exception as e:  # noqa: BLE001 - surface IMAP/parse failures too
+            _LOGGER.error("ESO login failed: %s", e)
+
+    async def async_close(self) -> None:
+        """Release the account's own aiohttp session (on entry unload).
+
+        The session shares Home Assistant's connector, which must stay open,
+        so it is detached rather than closed (closing it is reported as a
+        misuse of Home Assistant's sessions).
+        """
+        self._http.detach()
+
+    async def async_restore_session(self) -> bool:
+        """Resume the stored session without logging in, so it can be kept
+        alive from startup. Returns whether it is authenticated."""
+        async with self._async_form_lock:
+            try:
+                return await self._async_load_session() and await self._async_open_consumption()
+            except aiohttp.ClientError as e:
+                _LOGGER.debug("ESO: could not restore session: %s", e)
+                return False
+
+    async def async_keep_alive(self) -> bool:
+        """Load the consumption page so Drupal's autologout does not end an
+        idle session. Never logs in: a session found dead stays dead until
+        the next import. Returns whether the session is still alive."""
+        if not self.session_alive:
+            return False
+        async with self._async_form_lock:
+            cookies = self.cookies
+            try:
+                alive = await self._async_open_consumption()
+            except aiohttp.ClientError as e:
+                # A network hiccup does not prove the session dead.
+                _LOGGER.debug("ESO: keep-alive request failed: %s", e)
+                return self.session_alive
+        if not alive:
+            _LOGGER.info("ESO: session expired despite keep-alive")
+        elif self.cookies != cookies:
+            await self._async_save_session()
+        return alive
+
+    async def _async_load_session(self) -> bool:
+        if self._session_store is None:
+            return False
+        cookies = await self._session_store.async_load()
+        if not cookies:
+            return False
+        self._http.cookie_jar.clear()
+        self._http.cookie_jar.update_cookies(cookies, URL(self.login_url))
+        return True
+
+    async def _async_save_session(self) -> None:
+        if self._session_store is not None:
+            await self._session_store.async_save(records_from_morsels(self._http.cookie_jar))
+
+    async def _async_open_consumption(self) -> bool:
+        self.form_parser = FormParser()
+        count(COUNTER_REQUESTS)
+        async with self._http.get(self.login_url, headers={"User-Agent": USER_AGENT}) as response:
+            response.raise_for_status()
+            body = await response.read()
+        count(COUNTER_BYTES_RECEIVED, len(body))
+        html = body.decode(response.get_encoding())
+        self.cookies = {cookie.key: cookie.value for cookie in self._http.cookie_jar}
+        return self._read_consumption_page(html)
+
+    async def _async_full_login(self) -> None:
+        listener = await self._hass.async_add_executor_job(self._open_otp_listener)
+        try:
+            await self._async_submit_login(listener)
+        finally:
+            if listener is not None:
+                await self._hass.async_add_executor_job(listener.close)
+
+    async def _async_submit_login(self, listener: OtpListener | None) -> None:
+        count(COUNTER_REQUESTS)
+        async with self._http.post(
+            self.login_url, data=self._login_payload(), headers={"User-Agent": USER_AGENT}
+        ) as response:
+            response.raise_for_status()
+            tfa_url = str(response.url)
+            html = await response.text()
+        if "/user/login/tfa/" not in tfa_url:
+            _LOGGER.debug("ESO: no TFA redirect, login response url=%s", tfa_url)
+            return
+        login_started = datetime.now()
+        build_id = self._extract_tfa_build_id(html)
+        if not build_id:
+            _LOGGER.error("ESO: could not find TFA form_build_id on %s", tfa_url)
+            return
+        with phase(PHASE_OTP_WAIT):
+            code = await self._hass.async_add_executor_job(self._fetch_otp, login_started, listener)
+        if not code:
+            _LOGGER.error("ESO: did not receive a 2FA code via IMAP in time")
+            return
+        _LOGGER.info("ESO: submitting 2FA code")
+        count(COUNTER_REQUESTS)
+        async with self._http.post(
+            tfa_url,
+            data=self._tfa_payload(code, build_id),
+            headers={"User-Agent": USER_AGENT},
+        ) as submit:
+            submit.raise_for_status()
+
+    async def async_fetch(self, obj: str, date: date) -> list:
+        data = self._fetch_payload(obj, date)
+        if data is None:
+            return []
+        count(COUNTER_REQUESTS)
+        try:
+            with phase(PHASE_FETCH):
+                async with self._http.post(
+                    self.generation_url,
+                    data=data,
+                    headers={"User-Agent": USER_AGENT, **FETCH_HEADERS},
+                    allow_redirects=False,
+                ) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+        except aiohttp.ClientError as e:
+            _LOGGER.error("ESO fetch error: %s", e)
+            return []
+        count(COUNTER_BYTES_RECEIVED, len(body))
+        text = body.decode(response.get_encoding())
+        with phase(PHASE_PARSE):
+            commands = extract_commands(text)
+        _log_fetch_response(text, commands)
+        return commands
+
+    async def async_fetch_dataset(self, obj: str, date: datetime) -> dict | None:
+        if obj in self.dataset:
+            return self.dataset[obj]
+        self.dataset[obj] = {}
+        self.dataset[obj] = await self._async_fetch_week(obj, date)
+        return self.dataset[obj]
+
+    async def async_fetch_range_dataset(self, obj: str, start: date, end: date) -> dict:
+        weeks = [
+            await self._async_fetch_week(obj, active_date)
+            for active_date in plan_week_requests(start, end)
+        ]
+        return self._merge_weeks(weeks, start, end)
+
+    async def _async_fetch_week(self, obj: str, active_date: date) -> dict:
+        async with self._async_form_lock:
+            data = await self.async_fetch(obj, active_date)
+            self._update_build_id(data)
+        with phase(PHASE_PARSE):
+            return self._parse_week(data)
@@ -0,0 +1,53 @@
+"""DST-aware hour grid for provider timestamps (Europe/Vilnius).
+
+Providers report naive local wall-clock hours. Attaching the zone to such a
+value (``replace(tzinfo=...)``) labels the repeated hour twice when the clocks
+go back and invents an hour when they go forward. Instead every local day is
+expanded once into the UTC epochs of its real hour starts (23, 24 or 25 of
+them) and wall-clock hours are looked up in that cached grid.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from .const import HOUR_GRID_CACHE_DAYS, TIMEZONE
+from .hourly_series import HOUR_SECONDS
+
+_TZ = ZoneInfo(TIMEZONE)
+
+
+def _midnight(day: date) -> float:
+    return datetime(day.year, day.month, day.day, tzinfo=_TZ).timestamp()
+
+
+@lru_cache(maxsize=HOUR_GRID_CACHE_DAYS)
+def day_hours(day: date) -> tuple[float, ...]:
+    """Return the UTC epochs of every hour start of the local ``day``."""
+    start = _midnight(day)
+    end = _midnight(day + timedelta(days=1))
+    return tuple(
+        start + hour * HOUR_SECONDS
+        for hour in range(round((end - start) / HOUR_SECONDS))
+    )
+
+
+@lru_cache(maxsize=HOUR_GRID_CACHE_DAYS)
+def wall_hours(day: date) -> dict[int, tuple[float, ...]]:
+    """Return the UTC epochs of every local wall-clock hour of ``day``.
+
+    Normally one epoch per hour; two for the hour repeated when the clocks go
+    back, and the hour skipped when they go forward is missing.
+    """
+    grid: dict[int, tuple[float, ...]] = {}
+    for ts in day_hours(day):
+        hour = datetime.fromtimestamp(ts, _TZ).hour
+        grid[hour] = grid.get(hour, ()) + (ts,)
+    return grid
+
+
+def day_bounds(start: date, end: date) -> tuple[float, float]:
+    """Return the epochs enclosing the local days ``start``..``end`` (inclusive)."""
+    return _midnight(start), _midnight(end + timedelta(days=1))
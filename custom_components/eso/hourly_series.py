@@ -0,0 +1,155 @@
+"""Compact hourly series shared by the provider parsers and statistics builders.
+
+A series is a start epoch plus one ``array('d')`` slot per hour and a parallel
+``bytearray`` mask marking hours the provider did not report. Compared with a
+``dict[float, float]`` keyed by timestamps this stores 9 bytes per hour instead
+of a boxed float pair and a hash entry, keeps the hours ordered without
+re-sorting, and lets year-long backfills stay small. ``QuarterHourSeries`` is
+the same layout with a 15-minute slot, for meters read at that interval.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Iterator
+
+HOUR_SECONDS = 3600
+QUARTER_SECONDS = 900
+
+
+class HourlySeries:
+    """Hourly values starting at ``start`` (epoch seconds)."""
+
+    __slots__ = ("start", "values", "missing")
+
+    # Seconds covered by one slot.
+    step: float = HOUR_SECONDS
+
+    def __init__(
+        self,
+        start: float = 0.0,
+        values: array | None = None,
+        missing: bytearray | None = None,
+    ) -> None:
+        self.start: float = start
+        self.values: array = values if values is not None else array("d")
+        self.missing: bytearray = missing if missing is not None else bytearray()
+
+    @classmethod
+    def from_points(cls, points: list[tuple[float, float]]) -> HourlySeries:
+        """Build a series from ``(epoch, value)`` pairs in any order, sizing
+        the arrays once; a later pair for the same hour wins."""
+        if not points:
+            return cls()
+        start = min(ts for ts, _ in points)
+        size = round((max(ts for ts, _ in points) - start) / cls.step) + 1
+        values = array("d", bytes(8 * size))
+        missing = bytearray(b"\x01" * size)
+        for ts, value in points:
+            index = round((ts - start) / cls.step)
+            values[index] = value
+            missing[index] = 0
+        return cls(start, values, missing)
+
+    def __len__(self) -> int:
+        """Number of hours that carry a value."""
+        return len(self.missing) - self.missing.count(1)
+
+    def __contains__(self, ts: object) -> bool:
+        return isinstance(ts, (int, float)) and self.get(ts) is not None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(start={self.start}, slots={len(self.values)}, present={len(self)})"
+
+    def _index(self, ts: float) -> int:
+        return round((ts - self.start) / self.step)
+
+    def set(self, ts: float, value: float) -> None:
+        """Store ``value`` for the hour starting at ``ts``, growing as needed."""
+        if not self.values:
+            self.start = ts
+            self.values.append(value)
+            self.missing.append(0)
+            return
+        index = self._index(ts)
+        if index < 0:
+            self.values[:0] = array("d", bytes(8 * -index))
+            self.missing[:0] = b"\x01" * -index
+            self.start = ts
+            index = 0
+        elif index >= len(self.values):
+            grow = index - len(self.values) + 1
+            self.values.extend(array("d", bytes(8 * grow)))
+            self.missing.extend(b"\x01" * grow)
+        self.values[index] = value
+        self.missing[index] = 0
+
+    def get(self, ts: float) -> float | None:
+        index = self._index(ts)
+        if 0 <= index < len(self.values) and not self.missing[index]:
+            return self.values[index]
+        return None
+
+    def items(self) -> Iterator[tuple[float, float]]:
+        """Yield ``(epoch, value)`` for every reported hour, oldest first."""
+        start = self.start
+        missing = self.missing
+        for index, value in enumerate(self.values):
+            if not missing[index]:
+                yield start + index * self.step, value
+
+    @property
+    def first(self) -> float | None:
+        """Epoch of the first reported hour."""
+        index = self.missing.find(0)
+        return None if index < 0 else self.start + index * self.step
+
+    @property
+    def last(self) -> float | None:
+        """Epoch of the last reported hour."""
+        index = self.missing.rfind(0)
+        return None if index < 0 else self.start + index * self.step
+
+    def clip(self, start: float | None = None, end: float | None = None) -> HourlySeries:
+        """Return the hours in ``start <= ts < end`` as a new series."""
+        low = 0 if start is None else max(0, math.ceil((start - self.start) / self.step))
+        high = len(self.values)
+        if end is not None:
+            high = min(high, math.ceil((end - self.start) / self.step))
+        if low >= high:
+            return type(self)()
+        return type(self)(
+            self.start + low * self.step,
+            self.values[low:high],
+            self.missing[low:high],
+        )
+
+    def update(self, other: HourlySeries) -> None:
+        """Overwrite with the reported hours of ``other``."""
+        for ts, value in other.items():
+            self.set(ts, value)
+
+
+class QuarterHourSeries(HourlySeries):
+    """15-minute values starting at ``start`` (epoch seconds)."""
+
+    __slots__ = ()
+
+    step = QUARTER_SECONDS
+
+    def rollup(self) -> HourlySeries:
+        """Return the hourly sums; hours missing any quarter are left out, so
+        a partly published hour is not imported short."""
+        per_hour = round(HOUR_SECONDS / self.step)
+        offset = round((self.start % HOUR_SECONDS) / self.step)
+        hour_start = self.start - offset * self.step
+        values = array("d", bytes(8 * offset)) + self.values
+        missing = bytearray(b"\x01" * offset) + self.missing
+        points: list[tuple[float, float]] = []
+        for index in range(0, len(values) - per_hour + 1, per_hour):
+            if not any(missing[index : index + per_hour]):
+                points.append(
+                    (hour_start + index * self.step, sum(values[index : index + per_hour]))
+                )
+        return HourlySeries.from_points(points)
@@ -1,13 +1,42 @@
+import asyncio
+import json
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
+import aiohttp
 import requests
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import EXPORT_BALANCE_KEY, POWER_CONSUMED, POWER_RETURNED
 from .eso_client import ESOAuthError, ESOConnectionError
+from .hour_grid import day_bounds, day_hours
+from .hourly_series import HourlySeries, QuarterHourSeries
+from .import_metrics import (
+    COUNTER_BYTES_RECEIVED,
+    COUNTER_REQUESTS,
+    PHASE_FETCH,
+    PHASE_PARSE,
+    count,
+    phase,
+)
+from .record_parser import (
+    IGNITIS_QUARTER_STAMP,
+    IGNITIS_STAMP,
+    ParseReport,
+    record_epochs,
+    rollup_quarters,
+    series_from_points,
+)
 
-LOGIN_URL = "https://energy-smart-api.ignitis.lt/api/users/login"
-GENERATION_URL = "https://energy-smart-api.ignitis.lt/api/v2/objects/usage/{object}/day"
+BASE_URL = "https://energy-smart-api.ignitis.lt"
+LOGIN_PATH = "/api/users/login"
+GENERATION_PATH = "/api/v2/objects/usage/{object}/day"
+# Usage resolutions. The 15-minute value is what the API is expected to take
+# for meters read at that interval; it has not been confirmed against the
+# live service.
+INTERVAL_HOUR = "hour"
+INTERVAL_QUARTER = "15min"
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -17,10 +46,15 @@ class IgnitisClient:
         username: str,
         password: str,
         imap_config: dict | None = None,
-        session_file: str | None = None,
+        base_url: str = BASE_URL,
+        sub_hourly: bool = False,
     ):
         self.username: str = username
         self.password: str = password
+        # Fetch 15-minute data and roll it up into the hourly series
+        self.sub_hourly: bool = sub_hourly
+        self.login_url: str = base_url + LOGIN_PATH
+        self.generation_url: str = base_url + GENERATION_PATH
         self.dataset: dict = {}
         self.session: requests.Session = requests.Session()
         self.token: str | None = None
@@ -33,7 +67,7 @@ class IgnitisClient:
                 "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
             }
             response = self.session.post(
-                LOGIN_URL,
+                self.login_url,
                 data={
                     "email": self.username,
                     "password": self.password,
@@ -49,6 +83,9 @@ class IgnitisClient:
             login_response = response.json()
         except ValueError as e:
             raise ESOConnectionError(f"Invalid Ignitis login response: {e}") from e
+        self._apply_login(login_response)
+
+    def _apply_login(self, login_response: dict) -> None:
         token = login_response.get("token")
         if not token:
             raise ESOAuthError("Ignitis login did not return a token")
@@ -68,7 +105,7 @@ class IgnitisClient:
     def check_password(self) -> bool:
         try:
             response = self.session.post(
-                LOGIN_URL,
+                self.login_url,
                 data={"email": self.username, "password": self.password},
                 headers={
                     "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
@@ -94,20 +131,27 @@ class IgnitisClient:
         return list(self._objects)
 
     def fetch(self, obj: str, date: datetime) -> dict:
-        headers = {
-            "X-API-KEY": self.token,
-        }
         yesterday = date - timedelta(days=1)
+        return self.fetch_range(obj, yesterday, yesterday)
+
+    def fetch_range(self, obj: str, start: date, end: date) -> dict:
+        """Return the raw usage of ``obj`` for ``start``..``end`` (inclusive)
+        from a single dateFrom/dateTo request."""
+        return self._fetch_usage(obj, start, end)
+
+    def _usage_params(self, date_from: date, date_to: date) -> dict:
+        return {
+            "dateFrom": date_from.strftime("%Y-%m-%d"),
+            "dateTo": date_to.strftime("%Y-%m-%d"),
+            "interval": INTERVAL_QUARTER if self.sub_hourly else INTERVAL_HOUR,
+        }
+
+    def _fetch_usage(self, obj: str, date_from: date, date_to: date) -> dict:
         try:
-            params = {
-                "dateFrom": yesterday.strftime("%Y-%m-%d"),
-                "dateTo": yesterday.strftime("%Y-%m-%d"),
-                "interval": "hour",
-            }
             response = self.session.get(
-                GENERATION_URL.replace("{object}", obj),
-                params=params,
-                headers=headers,
+                self.generation_url.replace("{object}", obj),
+                params=self._usage_params(date_from, date_to),
+                headers={"X-API-KEY": self.token},
             )
             if response.status_code in (401, 403):
                 raise ESOAuthError("Ignitis rejected the API token")
@@ -121,27 +165,210 @@ class IgnitisClient:
     def fetch_dataset(self, obj: str, date: datetime) -> dict | None:
         self.dataset[obj] = {}
         data = self.fetch(obj, date)
-        self.dataset[obj] = self.parse_dataset(data)
+        self.dataset[obj] = self.parse_dataset(data, self.sub_hourly)
         return self.dataset[obj]
 
+    def fetch_range_dataset(self, obj: str, start: date, end: date) -> dict:
+        """Return the dataset of ``obj`` for ``start``..``end`` (inclusive)
+        from a single dateFrom/dateTo request.
+
+        Days at the end of the range that are not fully published yet are
+        left out, so a later import picks them up whole.
+        """
+        days = self.parse_range_dataset(
+            self.fetch_range(obj, start, end), start, end, self.sub_hourly
+        )
+        return self.merge_complete_days(obj, days)
+
     def get_dataset(self, obj: str) -> dict | None:
         if obj not in self.dataset:
             return None
         return self.dataset[obj]
 
+    @classmethod
+    def parse_range_dataset(
+        cls, dataset: dict, start: date, end: date, sub_hourly: bool = False
+    ) -> dict[date, dict]:
+        """Parse a range response into one dataset per local day of
+        ``start``..``end``; the export balance goes with the last day."""
+        parsed = cls.parse_dataset(dataset, sub_hourly)
+        days: dict[date, dict] = {}
+        day = start
+        while day <= end:
+            day_start, day_end = day_bounds(day, day)
+            days[day] = {
+                key: series.clip(day_start, day_end)
+                for key, series in parsed.items()
+                if key != EXPORT_BALANCE_KEY
+            }
+            days[day][EXPORT_BALANCE_KEY] = parsed[EXPORT_BALANCE_KEY] if day == end else None
+            day += timedelta(days=1)
+        return days
+
     @staticmethod
-    def parse_dataset(dataset: dict) -> dict:
-        result: dict = {POWER_CONSUMED: {}, POWER_RETURNED: {}, EXPORT_BALANCE_KEY: None}
+    def day_complete(dataset: dict, day: date) -> bool:
+        """Whether ``dataset`` has every hour of ``day`` in both directions."""
+        expected = len(day_hours(day))
+        return all(
+            len(dataset.get(series) or ()) >= expected
+            for series in (POWER_CONSUMED, POWER_RETURNED)
+        )
+
+    def merge_complete_days(self, obj: str, days: dict[date, dict]) -> dict:
+        """Merge per-day datasets up to the last complete day."""
+        incomplete = [day for day, dataset in days.items() if not self.day_complete(dataset, day)]
+        if incomplete:
+            _LOGGER.warning(
+                "Incomplete Ignitis data for %s on %s",
+                obj,
+                ", ".join(day.isoformat() for day in incomplete),
+            )
+        ordered = sorted(days)
+        while ordered and ordered[-1] in incomplete:
+            ordered.pop()
+        result: dict = {
+            POWER_CONSUMED: HourlySeries(),
+            POWER_RETURNED: HourlySeries(),
+            EXPORT_BALANCE_KEY: None,
+        }
+        for day in ordered:
+            for key, series in days[day].items():
+                if key != EXPORT_BALANCE_KEY:
+                    result.setdefault(key, type(series)()).update(series)
+        if ordered and ordered[-1] == max(days):
+            result[EXPORT_BALANCE_KEY] = days[ordered[-1]][EXPORT_BALANCE_KEY]
+        return result
+
+    @staticmethod
+    def parse_dataset(dataset: dict, sub_hourly: bool = False) -> dict:
+        """Parse a usage response into hourly series; with ``sub_hourly`` they
+        are rolled up from the 15-minute values."""
+        result: dict = {
+            POWER_CONSUMED: HourlySeries(),
+            POWER_RETURNED: HourlySeries(),
+            EXPORT_BALANCE_KEY: None,
+        }
         export = dataset.get("exportBalance")
         if isinstance(export, dict) and export.get("balance") is not None:
             result[EXPORT_BALANCE_KEY] = export["balance"]
-        for record in dataset.get("data", []):
+        records = dataset.get("data", [])
+        report = ParseReport("Ignitis")
+        consumed: list[tuple[float, float]] = []
+        returned: list[tuple[float, float]] = []
+        stamp = IGNITIS_QUARTER_STAMP if sub_hourly else IGNITIS_STAMP
+        for record, ts in zip(records, record_epochs(records, "startTime", stamp, report)):
+            if ts is None:
+                continue
             try:
-                timestamp = datetime.strptime(
-                    record["startTime"], "%Y-%m-%d %H:%M:%S"
-                ).timestamp()
-                result[POWER_CONSUMED][timestamp] = record.get("consumed") or 0.0
-                result[POWER_RETURNED][timestamp] = record.get("supplied") or 0.0
-            except Exception as e:  # noqa: BLE001
-                _LOGGER.error("Failed to parse dataset record %s: %s", record, e)
+                consumed_value = float(record.get("consumed") or 0.0)
+                returned_value = float(record.get("supplied") or 0.0)
+            except (TypeError, ValueError):
+                report.bad_record(record)
+                continue
+            consumed.append((ts, consumed_value))
+            returned.append((ts, returned_value))
+        report.log()
+        for key, points in ((POWER_CONSUMED, consumed), (POWER_RETURNED, returned)):
+            series = series_from_points(points, sub_hourly, "Ignitis")
+            if isinstance(series, QuarterHourSeries):
+                series = rollup_quarters(series, "Ignitis")
+            result[key] = series
         return result
+
+
+class AsyncIgnitisClient(IgnitisClient):
+    """IgnitisClient running its HTTP requests on Home Assistant's shared
+    aiohttp session; the API token travels in a header, so no cookies need
+    to be kept apart from other integrations.
+
+    The token is kept between imports: ``async_login`` only posts the
+    credentials when no token is held, and a token the API rejects is renewed
+    once, so retries of a few objects do not log the account in again."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        imap_config: dict | None = None,
+        base_url: str = BASE_URL,
+        sub_hourly: bool = False,
+    ):
+        super().__init__(username, password, imap_config, base_url, sub_hourly)
+        self._http: aiohttp.ClientSession = async_get_clientsession(hass)
+        self._login_lock = asyncio.Lock()
+
+    async def async_login(self) -> None:
+        self.dataset = {}
+        if self.token:
+            _LOGGER.debug("Reusing Ignitis API token")
+            return
+        await self._async_post_login()
+
+    async def _async_relogin(self, rejected_token: str | None) -> None:
+        """Replace a rejected token, once for all fetches that saw it."""
+        async with self._login_lock:
+            if self.token != rejected_token:
+                return
+            _LOGGER.debug("Ignitis API token rejected, logging in again")
+            self.token = None
+            await self._async_post_login()
+
+    async def _async_post_login(self) -> None:
+        count(COUNTER_REQUESTS)
+        try:
+            async with self._http.post(
+                self.login_url,
+                data={"email": self.username, "password": self.password},
+            ) as response:
+                response.raise_for_status()
+                _LOGGER.debug("Ignitis login response status: %s", response.status)
+                login_response = await response.json(content_type=None)
+        except aiohttp.ClientError as e:
+            _LOGGER.error("Ignitis login error: %s", e)
+            raise ESOConnectionError(str(e)) from e
+        except ValueError as e:
+            raise ESOConnectionError(f"Invalid Ignitis login response: {e}") from e
+        self._apply_login(login_response)
+
+    async def _async_fetch_usage(self, obj: str, date_from: date, date_to: date) -> dict:
+        for attempt in range(2):
+            token = self.token
+            count(COUNTER_REQUESTS)
+            try:
+                with phase(PHASE_FETCH):
+                    async with self._http.get(
+                        self.generation_url.replace("{object}", obj),
+                        params=self._usage_params(date_from, date_to),
+                        headers={"X-API-KEY": token},
+                    ) as response:
+                        rejected = response.status in (401, 403)
+                        if not rejected:
+                            response.raise_for_status()
+                            body = await response.read()
+            except aiohttp.ClientError as e:
+                _LOGGER.error("Ignitis fetch error: %s", e)
+                return {}
+            if not rejected:
+                break
+            if attempt:
+                raise ESOAuthError("Ignitis rejected the API token")
+            await self._async_relogin(token)
+        count(COUNTER_BYTES_RECEIVED, len(body))
+        text = body.decode(response.get_encoding())
+        _LOGGER.debug("Got fetch response: %s", text)
+        return json.loads(text)
+
+    async def async_fetch_dataset(self, obj: str, date: datetime) -> dict | None:
+        self.dataset[obj] = {}
+        yesterday = date - timedelta(days=1)
+        data = await self._async_fetch_usage(obj, yesterday, yesterday)
+        with phase(PHASE_PARSE):
+            self.dataset[obj] = self.parse_dataset(data, self.sub_hourly)
+        return self.dataset[obj]
+
+    async def async_fetch_range_dataset(self, obj: str, start: date, end: date) -> dict:
+        data = await self._async_fetch_usage(obj, start, end)
+        with phase(PHASE_PARSE):
+            days = self.parse_range_dataset(data, start, end, self.sub_hourly)
+            return self.merge_complete_days(obj, days)
@@ -0,0 +1,119 @@
+"""Per-phase timings and counters of import runs.
+
+An import run is made current with ``import_run`` for the duration of the
+import. The code doing the work records into it with ``phase`` and ``count``
+without having the run passed down: the run lives in a context variable, which
+tasks created during the import inherit. Executor jobs only see it when
+submitted through ``bind``. Outside of a run both helpers do nothing, so the
+clients can be used from the config flow unchanged.
+
+Phase times of concurrent tasks add up, so a phase can exceed the wall time of
+the run. ``otp_wait`` is part of ``login``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, TypeVar
+
+from homeassistant.util import dt as dt_util
+
+T = TypeVar("T")
+
+PHASE_LOGIN = "login"
+PHASE_OTP_WAIT = "otp_wait"
+PHASE_FETCH = "fetch"
+PHASE_PARSE = "parse"
+PHASE_PRICES = "prices"
+PHASE_SUM_LOOKUP = "sum_lookup"
+PHASE_WRITE = "write"
+
+COUNTER_REQUESTS = "requests"
+COUNTER_BYTES_RECEIVED = "bytes_received"
+COUNTER_POINTS_WRITTEN = "points_written"
+COUNTER_RECORDER_QUERIES = "recorder_queries"
+COUNTER_OBJECTS_IMPORTED = "objects_imported"
+COUNTER_OBJECTS_FAILED = "objects_failed"
+COUNTER_BAD_RECORDS = "bad_records"
+
+_CURRENT_RUN: contextvars.ContextVar[ImportRun | None] = contextvars.ContextVar(
+    "eso_import_run", default=None
+)
+
+
+@dataclass
+class ImportRun:
+    """Timings (seconds) and counters of one import run."""
+
+    kind: str
+    started: datetime = field(default_factory=dt_util.utcnow)
+    duration: float | None = None
+    phases: dict[str, float] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_count(self, name: str, value: int) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "started": self.started.isoformat(),
+            "duration": None if self.duration is None else round(self.duration, 3),
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+
+@contextmanager
+def import_run(kind: str, history: deque[ImportRun]) -> Iterator[ImportRun]:
+    """Make a new run current for the enclosed import and append it to
+    ``history`` once the import is done."""
+    run = ImportRun(kind)
+    token = _CURRENT_RUN.set(run)
+    started = time.monotonic()
+    try:
+        yield run
+    finally:
+        run.duration = time.monotonic() - started
+        _CURRENT_RUN.reset(token)
+        history.append(run)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the enclosed block to phase ``name``."""
+    run = _CURRENT_RUN.get()
+    if run is None:
+        yield
+        return
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        run.add_time(name, time.monotonic() - started)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add ``value`` to counter ``name`` of the current run."""
+    if (run := _CURRENT_RUN.get()) is not None:
+        run.add_count(name, value)
+
+
+def bind(func: Callable[..., T]) -> Callable[..., T]:
+    """Return ``func`` bound to the current context, so an executor job it
+    runs in records into the current run."""
+    return functools.partial(contextvars.copy_context().run, func)
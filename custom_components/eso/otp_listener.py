@@ -0,0 +1,138 @@
+"""Single-connection IMAP listener for the ESO one-time code email.
+
+The mailbox connection is opened before the password is submitted, so the TLS
+handshake and login are out of the way when ESO sends the code. Waiting uses
+IMAP IDLE (RFC 2177): the server pushes an ``EXISTS`` line the moment a message
+lands and the listener searches again right away. Servers without IDLE are
+polled with NOOP on the same connection, which also makes them report new
+messages. ``imaplib`` only gained IDLE in Python 3.14, so the command is issued
+by hand here.
+"""
+
+from __future__ import annotations
+
+import imaplib
+import logging
+import re
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def imap_connect(cfg: dict) -> imaplib.IMAP4:
+    """Connect to the mailbox server of ``cfg``: IMAP over SSL unless
+    ``ssl`` is set to False (plain IMAP, e.g. for a local test server)."""
+    if cfg.get("ssl", True):
+        return imaplib.IMAP4_SSL(cfg["host"], cfg.get("port", 993))
+    return imaplib.IMAP4(cfg["host"], cfg.get("port", 143))
+
+
+class OtpListener:
+    """One selected IMAP folder kept open for the duration of a login."""
+
+    def __init__(self, cfg: dict, poll_interval: float) -> None:
+        self._cfg = cfg
+        self._poll_interval = poll_interval
+        self._conn: imaplib.IMAP4 | None = None
+        self._idle = False
+        # UID the next message delivered to the folder will get, i.e. every
+        # message with a lower UID predates the login.
+        self.uid_next: int | None = None
+
+    @property
+    def conn(self) -> imaplib.IMAP4:
+        assert self._conn is not None
+        return self._conn
+
+    def open(self) -> None:
+        conn = imap_connect(self._cfg)
+        try:
+            conn.login(self._cfg["username"], self._cfg["password"])
+            conn.select(self._cfg.get("folder", "INBOX"))
+        except Exception:
+            self._logout(conn)
+            raise
+        self._conn = conn
+        self._idle = "IDLE" in conn.capabilities
+        self.uid_next = self._read_uid_next(conn)
+        _LOGGER.debug("ESO: mailbox open, IDLE %s", "supported" if self._idle else "not supported")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._logout(self._conn)
+            self._conn = None
+
+    def wait(self, find: Callable[[imaplib.IMAP4], T | None], timeout: float) -> T | None:
+        """Return the first non-None result of ``find`` on the open folder,
+        re-running it whenever the folder may have changed, or None once
+        ``timeout`` seconds have passed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            result = find(self.conn)
+            if result is not None:
+                return result
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if self._idle:
+                if not self._wait_idle(remaining):
+                    return None
+            else:
+                time.sleep(min(self._poll_interval, remaining))
+                self.conn.noop()
+
+    def _wait_idle(self, timeout: float) -> bool:
+        """IDLE until the server reports a new message (True) or ``timeout``
+        passes (False). A timed out read leaves the socket unusable, so the
+        connection is dropped in that case."""
+        conn = self.conn
+        tag = conn._new_tag()  # noqa: SLF001 - imaplib has no public IDLE before 3.14
+        conn.send(tag + b" IDLE\r\n")
+        line = conn.readline()
+        if not line.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE rejected: {line!r}")
+        conn.sock.settimeout(timeout)
+        try:
+            while True:
+                line = conn.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("connection closed during IDLE")
+                if line.startswith(b"*") and (b"EXISTS" in line or b"RECENT" in line):
+                    break
+            conn.send(b"DONE\r\n")
+            while not line.startswith(tag):
+                line = conn.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("connection closed ending IDLE")
+        except TimeoutError:
+            self._conn = None
+            conn.shutdown()
+            return False
+        finally:
+            if self._conn is not None:
+                conn.sock.settimeout(None)
+        return True
+
+    def _read_uid_next(self, conn: imaplib.IMAP4) -> int | None:
+        """UIDNEXT from the SELECT response, or from STATUS when the server
+        did not include it."""
+        _, data = conn.response("UIDNEXT")
+        if data and data[-1]:
+            return int(data[-1])
+        try:
+            typ, data = conn.status(self._cfg.get("folder", "INBOX"), "(UIDNEXT)")
+        except imaplib.IMAP4.error:
+            return None
+        match = re.search(rb"UIDNEXT (\d+)", data[0] or b"") if typ == "OK" and data else None
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def _logout(conn: imaplib.IMAP4) -> None:
+        try:
+            conn.logout()
+        except Exception:  # noqa: BLE001
+            pass
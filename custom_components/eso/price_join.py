@@ -0,0 +1,135 @@
+"""Alignment of price entity statistics to the hourly consumption grid.
+
+Prices are read from the recorder statistics of the configured price entity and
+averaged into UTC hour buckets, so they line up with the epochs of the
+``HourlySeries`` the providers produce. Rows finer than an hour (the 5-minute
+short-term statistics of a 15-minute Nord Pool feed) are averaged into their
+hour; hours without a long-term row are filled from the short-term statistics
+when they are still retained. All price entities of an import run are loaded
+with one recorder job covering the whole range, however many objects and days
+the run spans.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from array import array
+from datetime import datetime
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .hourly_series import HOUR_SECONDS, HourlySeries
+from .import_metrics import COUNTER_RECORDER_QUERIES, bind, count
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PriceJoin:
+    """Hourly prices of the price entities used by one import run."""
+
+    def __init__(self, hass: HomeAssistant, entity_ids: set[str]) -> None:
+        self._hass = hass
+        self._entity_ids = entity_ids
+        self._lock = asyncio.Lock()
+        self._start: float | None = None
+        self._end: float | None = None
+        self._prices: dict[str, HourlySeries] = {}
+
+    async def async_prices(self, entity_id: str, start: float, end: float) -> HourlySeries:
+        """Return the hourly prices of ``entity_id`` covering ``start``..``end``.
+
+        The first call loads every entity of the run for the requested range;
+        later calls inside that range are answered from memory.
+        """
+        async with self._lock:
+            if self._start is None or start < self._start or end > self._end:
+                if self._start is not None:
+                    start, end = min(start, self._start), max(end, self._end)
+                self._prices = await get_instance(self._hass).async_add_executor_job(
+                    bind(_get_hourly_prices),
+                    self._hass,
+                    self._entity_ids | {entity_id},
+                    dt_util.utc_from_timestamp(start),
+                    dt_util.utc_from_timestamp(end + HOUR_SECONDS),
+                )
+                self._start, self._end = start, end
+        return self._prices.get(entity_id, HourlySeries())
+
+
+def join_prices(energy: HourlySeries, prices: HourlySeries) -> tuple[HourlySeries, list[float]]:
+    """Multiply each reported hour of ``energy`` by its hour's price.
+
+    Returns the cost series and the epochs of hours without a price. Those
+    hours are left unreported in the cost series rather than costed at 0, so a
+    later import can fill them once the price is known.
+    """
+    hours = len(energy.values)
+    cost = HourlySeries(energy.start, array("d", bytes(8 * hours)), bytearray(energy.missing))
+    unmatched: list[float] = []
+    for index in range(hours):
+        if energy.missing[index]:
+            continue
+        ts = energy.start + index * HOUR_SECONDS
+        price = prices.get(ts)
+        if price is None:
+            cost.missing[index] = 1
+            unmatched.append(ts)
+            continue
+        cost.values[index] = round(energy.values[index] * price, 5)
+    return cost, unmatched
+
+
+def _row_price(row: dict) -> float | None:
+    mean = row.get("mean")
+    return mean if mean is not None else row.get("state")
+
+
+def _hourly_average(rows: list[dict], into: HourlySeries | None = None) -> HourlySeries:
+    """Average rows into hour buckets, only filling hours ``into`` lacks."""
+    series = into if into is not None else HourlySeries()
+    buckets: dict[float, list[float]] = {}
+    for row in rows:
+        price = _row_price(row)
+        if price is None:
+            continue
+        hour = row["start"] - row["start"] % HOUR_SECONDS
+        if into is not None and hour in into:
+            continue
+        buckets.setdefault(hour, []).append(price)
+    for hour in sorted(buckets):
+        values = buckets[hour]
+        series.set(hour, sum(values) / len(values))
+    return series
+
+
+def _get_hourly_prices(
+    hass: HomeAssistant,
+    entity_ids: set[str],
+    start: datetime,
+    end: datetime,
+) -> dict[str, HourlySeries]:
+    stats = statistics_during_period(
+        hass, start, end, entity_ids, "hour", None, {"mean", "state"}
+    )
+    count(COUNTER_RECORDER_QUERIES)
+    prices = {
+        entity_id: _hourly_average((stats or {}).get(entity_id, []))
+        for entity_id in entity_ids
+    }
+    expected = round((end - start).total_seconds() / HOUR_SECONDS)
+    incomplete = {
+        entity_id for entity_id, series in prices.items() if len(series) < expected
+    }
+    if incomplete:
+        short_term = statistics_during_period(
+            hass, start, end, incomplete, "5minute", None, {"mean", "state"}
+        )
+        count(COUNTER_RECORDER_QUERIES)
+        for entity_id in incomplete:
+            _hourly_average((short_term or {}).get(entity_id, []), prices[entity_id])
+    _LOGGER.debug("Loaded hourly prices between %s and %s: %s", start, end, prices)
+    return prices
@@ -0,0 +1,166 @@
+"""Batch parsing of the providers' hourly records.
+
+Both providers stamp records with fixed-width local wall-clock times (ESO
+``YYYYmmddHHMM``, Ignitis ``YYYY-mm-dd HH:MM:SS``). Instead of a ``strptime``
+and a grid lookup per record, the fields are cut out with integer slicing and
+each local day's hour grid is fetched once per batch, keyed by the stamp's date
+prefix. Rows that cannot be parsed are collected in a ``ParseReport`` and
+logged once per batch instead of once per row.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Any
+
+from .hour_grid import wall_hours
+from .hourly_series import HOUR_SECONDS, HourlySeries, QuarterHourSeries
+from .import_metrics import COUNTER_BAD_RECORDS, count
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bad records quoted in the summary logged for a batch.
+REPORT_EXAMPLES = 3
+
+
+@dataclass(frozen=True)
+class StampFormat:
+    """Positions of the fields of a fixed-width timestamp."""
+
+    length: int
+    year: slice
+    month: slice
+    day: slice
+    hour: slice
+    # Read only for sub-hourly records; hourly records start on the hour.
+    minute: slice | None = None
+
+
+ESO_STAMP = StampFormat(12, slice(0, 4), slice(4, 6), slice(6, 8), slice(8, 10))
+IGNITIS_STAMP = StampFormat(19, slice(0, 4), slice(5, 7), slice(8, 10), slice(11, 13))
+ESO_QUARTER_STAMP = replace(ESO_STAMP, minute=slice(10, 12))
+IGNITIS_QUARTER_STAMP = replace(IGNITIS_STAMP, minute=slice(14, 16))
+
+
+@dataclass
+class ParseReport:
+    """Records of one batch that were skipped, for a single log line."""
+
+    source: str
+    bad: int = 0
+    skipped_hours: int = 0
+    examples: list[Any] = field(default_factory=list)
+
+    def bad_record(self, record: Any) -> None:
+        self.bad += 1
+        if len(self.examples) < REPORT_EXAMPLES:
+            self.examples.append(record)
+
+    def log(self) -> None:
+        if self.skipped_hours:
+            _LOGGER.debug(
+                "Skipped %d %s records of non-existent local hours",
+                self.skipped_hours,
+                self.source,
+            )
+        if self.bad:
+            count(COUNTER_BAD_RECORDS, self.bad)
+            _LOGGER.warning(
+                "Skipped %d unparseable %s records, e.g. %s",
+                self.bad,
+                self.source,
+                self.examples,
+            )
+
+
+def record_epochs(
+    records: Sequence[dict],
+    key: str,
+    stamp: StampFormat,
+    report: ParseReport,
+) -> list[float | None]:
+    """Return the UTC epoch of each record's ``key`` timestamp, in order.
+
+    ``None`` marks records to skip: bad timestamps (added to ``report``) and
+    hours skipped when the clocks go forward. A repeated hour when the clocks
+    go back resolves to its first real hour, then its second.
+    """
+    minute_slice = stamp.minute
+    date_prefix = slice(0, max(stamp.year.stop, stamp.month.stop, stamp.day.stop))
+    grids: dict[str, dict[int, tuple[float, ...]]] = {}
+    taken: set[float] = set()
+    epochs: list[float | None] = []
+    for record in records:
+        try:
+            text = record[key]
+            if len(text) != stamp.length:
+                raise ValueError(text)
+            prefix = text[date_prefix]
+            grid = grids.get(prefix)
+            if grid is None:
+                grid = grids[prefix] = wall_hours(
+                    date(int(text[stamp.year]), int(text[stamp.month]), int(text[stamp.day]))
+                )
+            hour = int(text[stamp.hour])
+            minute = int(text[minute_slice]) if minute_slice else 0
+            if not (0 <= hour <= 23 and 0 <= minute <= 59):
+                raise ValueError(text)
+        except (KeyError, TypeError, ValueError):
+            report.bad_record(record)
+            epochs.append(None)
+            continue
+        hour_epochs = grid.get(hour, ())
+        if not hour_epochs:
+            report.skipped_hours += 1
+            epochs.append(None)
+        elif len(hour_epochs) == 1:
+            epochs.append(hour_epochs[0] + minute * 60)
+        else:
+            candidates = [ts + minute * 60 for ts in hour_epochs]
+            ts = next((ts for ts in candidates if ts not in taken), candidates[-1])
+            taken.add(ts)
+            epochs.append(ts)
+    return epochs
+
+
+def has_sub_hourly_points(points: Sequence[tuple[float, float]]) -> bool:
+    """Whether any point starts off the hour.
+
+    A provider that ignores the 15-minute request answers with hourly rows;
+    read as quarters they would fill one slot per hour and never roll up.
+    """
+    return any(ts % HOUR_SECONDS for ts, _ in points)
+
+
+def series_from_points(
+    points: list[tuple[float, float]], sub_hourly: bool, source: str
+) -> HourlySeries:
+    """Return a QuarterHourSeries when ``sub_hourly`` was requested and the
+    points really are sub-hourly, otherwise an hourly series."""
+    if not sub_hourly:
+        return HourlySeries.from_points(points)
+    if points and not has_sub_hourly_points(points):
+        _LOGGER.warning(
+            "%s returned hourly data although 15-minute data was requested, "
+            "importing it as hourly",
+            source,
+        )
+        return HourlySeries.from_points(points)
+    return QuarterHourSeries.from_points(points)
+
+
+def rollup_quarters(quarters: QuarterHourSeries, source: str) -> HourlySeries:
+    """Return the hourly rollup of ``quarters``, warning when quarters were
+    received but no hour is complete."""
+    hourly = quarters.rollup()
+    if quarters and not hourly:
+        _LOGGER.warning(
+            "%s returned %d 15-minute values but no hour with all of its quarters, "
+            "nothing can be imported from them",
+            source,
+            len(quarters),
+        )
+    return hourly
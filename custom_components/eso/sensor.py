@@ -0,0 +1,138 @@
+"""Diagnostic sensors describing the last import run of an account.
+
+All of them are disabled by default; enable them to follow import performance
+over time. The full history of recent runs is in the config entry diagnostics.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+)
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from . import ESOConfigEntry
+from .const import DOMAIN, SIGNAL_IMPORT_FINISHED
+from .import_metrics import (
+    COUNTER_BYTES_RECEIVED,
+    COUNTER_POINTS_WRITTEN,
+    COUNTER_RECORDER_QUERIES,
+    COUNTER_REQUESTS,
+    ImportRun,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ESOImportSensorEntityDescription(SensorEntityDescription):
+    """Sensor reading one value of the last import run."""
+
+    value_fn: Callable[[ImportRun], StateType | datetime]
+    attributes_fn: Callable[[ImportRun], dict[str, Any]] | None = None
+
+
+SENSORS: tuple[ESOImportSensorEntityDescription, ...] = (
+    ESOImportSensorEntityDescription(
+        key="last_import_started",
+        translation_key="last_import_started",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda run: run.started,
+    ),
+    ESOImportSensorEntityDescription(
+        key="last_import_duration",
+        translation_key="last_import_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=1,
+        value_fn=lambda run: run.duration,
+        attributes_fn=lambda run: run.as_dict()["phases"],
+    ),
+    ESOImportSensorEntityDescription(
+        key="last_import_requests",
+        translation_key="last_import_requests",
+        value_fn=lambda run: run.counters.get(COUNTER_REQUESTS, 0),
+    ),
+    ESOImportSensorEntityDescription(
+        key="last_import_bytes_received",
+        translation_key="last_import_bytes_received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda run: run.counters.get(COUNTER_BYTES_RECEIVED, 0),
+    ),
+    ESOImportSensorEntityDescription(
+        key="last_import_points_written",
+        translation_key="last_import_points_written",
+        value_fn=lambda run: run.counters.get(COUNTER_POINTS_WRITTEN, 0),
+    ),
+    ESOImportSensorEntityDescription(
+        key="last_import_recorder_queries",
+        translation_key="last_import_recorder_queries",
+        value_fn=lambda run: run.counters.get(COUNTER_RECORDER_QUERIES, 0),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ESOConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up the import diagnostic sensors of an account."""
+    async_add_entities(ESOImportSensor(entry, description) for description in SENSORS)
+
+
+class ESOImportSensor(SensorEntity):
+    """A value of the account's last import run."""
+
+    entity_description: ESOImportSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = False
+
+    def __init__(
+        self, entry: ESOConfigEntry, description: ESOImportSensorEntityDescription
+    ) -> None:
+        self.entity_description = description
+        self._entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        self._update_from_run()
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_IMPORT_FINISHED.format(self._entry.entry_id),
+                self._async_import_finished,
+            )
+        )
+
+    @callback
+    def _async_import_finished(self) -> None:
+        self._update_from_run()
+        self.async_write_ha_state()
+
+    def _update_from_run(self) -> None:
+        runs = self._entry.runtime_data.import_runs
+        if not runs:
+            return
+        run = runs[-1]
+        self._attr_native_value = self.entity_description.value_fn(run)
+        if self.entity_description.attributes_fn is not None:
+            self._attr_extra_state_attributes = self.entity_description.attributes_fn(run)
@@ -0,0 +1,106 @@
+"""Per-account persistence of the authenticated ESO session cookies.
+
+Each account keeps its cookies in its own ``Store`` keyed by the config entry's
+unique ID, so accounts no longer overwrite each other's session. ``Store``
+writes atomically and off the event loop. Every cookie is saved with its
+expiry, so a stored session whose Drupal session cookie has expired is dropped
+on load without a request to ESO.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterable
+from email.utils import parsedate_to_datetime
+from http.cookies import Morsel, SimpleCookie
+from http.cookiejar import Cookie
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import SESSION_STORAGE_KEY, SESSION_STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+# Drupal names its session cookie SESS<hash> (SSESS<hash> over HTTPS)
+SESSION_COOKIE_PREFIXES = ("SESS", "SSESS")
+
+
+def _morsel_expires(morsel: Morsel) -> float | None:
+    if morsel["max-age"]:
+        return time.time() + int(morsel["max-age"])
+    if morsel["expires"]:
+        try:
+            return parsedate_to_datetime(morsel["expires"]).timestamp()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def records_from_morsels(morsels: Iterable[Morsel]) -> list[dict]:
+    """Cookie records of an aiohttp cookie jar."""
+    return [
+        {
+            "name": morsel.key,
+            "value": morsel.value,
+            "domain": morsel["domain"],
+            "path": morsel["path"] or "/",
+            "expires": _morsel_expires(morsel),
+        }
+        for morsel in morsels
+    ]
+
+
+def records_from_cookies(cookies: Iterable[Cookie]) -> list[dict]:
+    """Cookie records of a ``requests`` cookie jar."""
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path or "/",
+            "expires": cookie.expires,
+        }
+        for cookie in cookies
+    ]
+
+
+class SessionStore:
+    """Stored session cookies of one account."""
+
+    def __init__(self, hass: HomeAssistant, unique_id: str) -> None:
+        self._store: Store[dict] = Store(
+            hass, SESSION_STORAGE_VERSION, f"{SESSION_STORAGE_KEY}.{slugify(unique_id)}"
+        )
+
+    async def async_load(self) -> SimpleCookie | None:
+        """Return the unexpired stored cookies, or None when there is no
+        session left to resume."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+        now = time.time()
+        cookies = SimpleCookie()
+        for record in data.get("cookies", []):
+            expires = record.get("expires")
+            if expires is not None and expires <= now:
+                continue
+            cookies[record["name"]] = record["value"]
+            morsel = cookies[record["name"]]
+            morsel["path"] = record.get("path") or "/"
+            if record.get("domain"):
+                morsel["domain"] = record["domain"]
+            if expires is not None:
+                morsel["max-age"] = str(int(expires - now))
+        if not any(name.startswith(SESSION_COOKIE_PREFIXES) for name in cookies):
+            _LOGGER.debug("ESO: stored session has expired")
+            return None
+        return cookies
+
+    async def async_save(self, records: list[dict]) -> None:
+        await self._store.async_save({"saved": time.time(), "cookies": records})
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -0,0 +1,90 @@
+"""Re-chaining of cumulative sums after a write into the past.
+
+Writing hours that are older than the newest row of a statistic (``import_now``
+with a past date, ``import_range`` backfills, provider corrections) gives those
+hours fresh cumulative sums, but every later row already in the recorder keeps
+its old ``sum``, leaving a step in the long-term statistics. The later rows are
+streamed back in bounded chunks and rewritten with the difference between the
+new and the old sum, so a correction never needs a full wipe and re-import.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    statistics_during_period,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import RECHAIN_CHUNK_DAYS
+from .import_metrics import COUNTER_RECORDER_QUERIES, count
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sums differing by less than this are already chained.
+SUM_TOLERANCE = 1e-6
+
+
+async def async_rechain_sums(
+    hass: HomeAssistant,
+    metadata: StatisticMetaData,
+    last_start: datetime,
+    last_sum: float,
+) -> int:
+    """Shift the sums of all rows after ``last_start`` to continue from
+    ``last_sum``, the new cumulative sum of the hour at ``last_start``.
+
+    The offset is taken from the first later row (its old sum minus its state
+    is the old sum before it) and applied chunk by chunk, so memory stays
+    bounded however long the tail is. Returns the number of rows rewritten.
+    """
+    statistic_id = metadata["statistic_id"]
+    recorder = get_instance(hass)
+    chunk_start = last_start + timedelta(hours=1)
+    now = dt_util.utcnow()
+    delta: float | None = None
+    rewritten = 0
+    while chunk_start <= now:
+        chunk_end = chunk_start + timedelta(days=RECHAIN_CHUNK_DAYS)
+        stats = await recorder.async_add_executor_job(
+            statistics_during_period,
+            hass,
+            chunk_start,
+            chunk_end,
+            {statistic_id},
+            "hour",
+            None,
+            {"state", "sum"},
+        )
+        count(COUNTER_RECORDER_QUERIES)
+        chunk_start = chunk_end
+        rows = (stats or {}).get(statistic_id)
+        if not rows:
+            continue
+        if delta is None:
+            first = rows[0]
+            delta = last_sum - ((first.get("sum") or 0.0) - (first.get("state") or 0.0))
+            if abs(delta) < SUM_TOLERANCE:
+                _LOGGER.debug("Later sums of %s are already chained", statistic_id)
+                return 0
+        statistics = [
+            StatisticData(
+                start=dt_util.utc_from_timestamp(row["start"]),
+                state=row.get("state"),
+                sum=(row.get("sum") or 0.0) + delta,
+            )
+            for row in rows
+        ]
+        async_add_external_statistics(hass, metadata, statistics)
+        rewritten += len(statistics)
+    if rewritten:
+        _LOGGER.info(
+            "Re-chained %d later hours of %s by %+.5f", rewritten, statistic_id, delta
+        )
+    return rewritten
@@ -0,0 +1,124 @@
+"""Time-of-use tariffs evaluated over hourly series.
+
+Lithuanian two-zone tariffs switch zones on standard (winter) time all year:
+the night zone runs from 23:00 to 07:00 on workdays (00:00 to 08:00 on the
+summer wall clock) and covers weekends entirely. Expressed in standard time the
+zone pattern repeats every week, so it is computed once as a 168-hour mask and
+tiled over a series instead of converting every hour to local time.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from itertools import repeat
+
+from .const import (
+    CONF_DISTRIBUTION_FEE,
+    CONF_FIXED_PRICE,
+    CONF_NIGHT_DISTRIBUTION_FEE,
+    CONF_NIGHT_PRICE,
+    TARIFF_NIGHT_END_HOUR,
+    TARIFF_NIGHT_START_HOUR,
+    TARIFF_STANDARD_UTC_OFFSET_HOURS,
+)
+from .hourly_series import HOUR_SECONDS, HourlySeries
+
+WEEK_HOURS = 7 * 24
+# The Unix epoch fell on a Thursday (weekday 3, Monday being 0).
+_EPOCH_WEEKDAY = 3
+
+
+def _night_pattern() -> bytes:
+    pattern = bytearray(WEEK_HOURS)
+    for week_hour in range(WEEK_HOURS):
+        weekday, hour = divmod(week_hour, 24)
+        if (
+            weekday >= 5
+            or hour >= TARIFF_NIGHT_START_HOUR
+            or hour < TARIFF_NIGHT_END_HOUR
+        ):
+            pattern[week_hour] = 1
+    return bytes(pattern)
+
+
+# Night flags for every hour of a standard-time week starting on Monday 00:00
+_NIGHT_PATTERN = _night_pattern()
+
+
+def night_mask(start: float, hours: int) -> bytes:
+    """Return night-zone flags for ``hours`` consecutive hours from ``start``."""
+    standard_hour = round(start / HOUR_SECONDS) + TARIFF_STANDARD_UTC_OFFSET_HOURS
+    offset = (standard_hour + _EPOCH_WEEKDAY * 24) % WEEK_HOURS
+    weeks = (offset + hours) // WEEK_HOURS + 1
+    return (_NIGHT_PATTERN * weeks)[offset : offset + hours]
+
+
+@dataclass(frozen=True)
+class Tariff:
+    """Per-kWh energy prices and distribution fees of an object."""
+
+    day_price: float = 0.0
+    night_price: float = 0.0
+    day_fee: float = 0.0
+    night_fee: float = 0.0
+
+    @classmethod
+    def from_object(cls, obj: dict) -> Tariff:
+        """Build the tariff of an object; night values default to the day ones."""
+        day_price = obj.get(CONF_FIXED_PRICE) or 0.0
+        day_fee = obj.get(CONF_DISTRIBUTION_FEE) or 0.0
+        night_price = obj.get(CONF_NIGHT_PRICE)
+        night_fee = obj.get(CONF_NIGHT_DISTRIBUTION_FEE)
+        return cls(
+            day_price=day_price,
+            night_price=day_price if night_price is None else night_price,
+            day_fee=day_fee,
+            night_fee=day_fee if night_fee is None else night_fee,
+        )
+
+    @property
+    def has_fees(self) -> bool:
+        return bool(self.day_fee or self.night_fee)
+
+    def _rates(self, series: HourlySeries, day: float, night: float) -> array:
+        hours = len(series.values)
+        if day == night:
+            return array("d", repeat(day, hours))
+        rates = (day, night)
+        return array("d", (rates[flag] for flag in night_mask(series.start, hours)))
+
+    def cost(self, energy: HourlySeries, include_fees: bool = True) -> HourlySeries:
+        """Return the cost of every reported hour of ``energy``.
+
+        Distribution fees are only paid on energy taken from the grid; pass
+        ``include_fees=False`` to price returned energy at the energy rate.
+        """
+        if include_fees:
+            rates = self._rates(
+                energy, self.day_price + self.day_fee, self.night_price + self.night_fee
+            )
+        else:
+            rates = self._rates(energy, self.day_price, self.night_price)
+        return HourlySeries(
+            energy.start,
+            array(
+                "d",
+                (
+                    0.0 if missing else round(kwh * rate, 5)
+                    for kwh, rate, missing in zip(energy.values, rates, energy.missing)
+                ),
+            ),
+            bytearray(energy.missing),
+        )
+
+    def with_fees(self, prices: HourlySeries) -> HourlySeries:
+        """Return hourly ``prices`` with the distribution fee of each hour added."""
+        if not self.has_fees:
+            return prices
+        fees = self._rates(prices, self.day_fee, self.night_fee)
+        return HourlySeries(
+            prices.start,
+            array("d", (price + fee for price, fee in zip(prices.values, fees))),
+            bytearray(prices.missing),
+        )
@@ -0,0 +1,26 @@
+"""Tests for the targeted drupal_ajax response extraction."""
+
+import json
+
+from custom_components.eso.ajax_parser import FORM_SETTINGS_KEY, extract_commands
+
+SETTINGS = {"command": "settings", "settings": {FORM_SETTINGS_KEY: {"graphics_data": {"datasets": []}}}}
+INSERT = {"command": "insert", "data": '<form id="eso-consumption-history-form">"quoted"</form>'}
+
+
+def _build_ids(commands: list) -> list:
+    return [command["new"] for command in commands if command.get("command") == "update_build_id"]
+
+
+def test_update_build_id_command_first() -> None:
+    update = {"command": "update_build_id", "old": "form-old", "new": "form-new"}
+    commands = extract_commands(json.dumps([INSERT, update, SETTINGS]))
+    assert _build_ids(commands) == ["form-new"]
+    assert any(command.get("command") == "settings" for command in commands)
+
+
+def test_update_build_id_other_key_order() -> None:
+    update = {"new": "form-new", "command": "update_build_id", "old": "form-old"}
+    commands = extract_commands(json.dumps([INSERT, update, SETTINGS]))
+    assert _build_ids(commands) == ["form-new"]
+    assert any(command.get("command") == "settings" for command in commands)
@@ -0,0 +1,44 @@
+"""Tests for the single-pass consumption page scan."""
+
+from custom_components.eso.consumption_page import scan_consumption_page
+
+FORM_START = '<form class="eso-consumption-history-form" id="eso-consumption-history-form" method="post">'
+TOKENS = (
+    '<input type="hidden" name="form_build_id" value="form-abc">'
+    '<input type="hidden" name="form_token" value="token">'
+    '<input type="hidden" name="form_id" value="eso_consumption_history_form">'
+)
+SELECT = (
+    '<select name="objects[]" multiple>'
+    '<option value="100001">Atsitiktine g. 25-14, 36237 Vilnius, 12222222</option>'
+    '<option value="100002">Kita g. 1, Kaunas, 13333333</option>'
+    "</select>"
+)
+OBJECTS = {
+    "100001": "Atsitiktine g. 25-14, 36237 Vilnius, 12222222",
+    "100002": "Kita g. 1, Kaunas, 13333333",
+}
+
+
+def _page(body: str) -> str:
+    return f"<html><head><script>var a = 1;</script></head><body>{body}</body></html>"
+
+
+def test_select_inside_form() -> None:
+    page = scan_consumption_page(_page(f"{FORM_START}{TOKENS}{SELECT}</form>"))
+    assert page.is_consumption
+    assert page.form["form_build_id"] == "form-abc"
+    assert page.objects == OBJECTS
+
+
+def test_select_outside_form() -> None:
+    page = scan_consumption_page(_page(f"{FORM_START}{TOKENS}</form><div>{SELECT}</div>"))
+    assert page.is_consumption
+    assert page.form["form_token"] == "token"
+    assert page.objects == OBJECTS
+
+
+def test_login_page() -> None:
+    page = scan_consumption_page(_page('<form id="user-login-form"><input name="name"></form>'))
+    assert not page.is_consumption
+    assert page.objects == {}